@@ -0,0 +1,157 @@
+import argparse
+import sys
+
+# Entry point `logic-gate-ai`. Modul ini sengaja hanya meng-import argparse; setiap
+# subcommand memuat dependensi beratnya (numpy, TensorFlow, process pool) saat dipanggil.
+
+
+def _evaluate(args):
+    from src.tools.run_mcts_evaluation import evaluate_ai_performance
+    evaluate_ai_performance(num_games=args.games, ai1_simulations=args.sims1, ai2_simulations=args.sims2,
+                            record_path=args.record, record_search_stats=args.record_stats)
+
+
+def _compare(args):
+    from src.tools.run_mcts_evaluation import compare_different_simulations
+    position_cache = None
+    if args.cache:
+        from src.game_logic.position_cache import PositionCache
+        position_cache = PositionCache()
+    compare_different_simulations(num_games_per_config=args.games, position_cache=position_cache,
+                                  record_path=args.record)
+
+
+def _openings(args):
+    from src.tools.run_mcts_evaluation import evaluate_opening_strategies
+    evaluate_opening_strategies(num_games=args.games, record_path=args.record, replay_only=args.replay)
+
+
+def _analyze(args):
+    from src.tools.game_record_analyzer import analyze_game_log
+    for path in args.paths:
+        analyze_game_log(path)
+
+
+def _difficulty(args):
+    from src.tools.run_difficulty_evaluation import run_difficulty_tournament
+    run_difficulty_tournament(num_games=args.games, use_position_cache=args.cache, record_path=args.record)
+
+
+def _calibrate(args):
+    from src.tools.run_difficulty_calibration import run_difficulty_calibration
+    kwargs = {'output_path': args.output} if args.output else {}
+    run_difficulty_calibration(num_games=args.games, max_simulations=args.max_sims,
+                               num_workers=args.workers, **kwargs)
+
+
+def _keras_compare(args):
+    from src.tools.run_keras_comparison import run_keras_comparison
+    run_keras_comparison(model_path=args.model, num_games=args.games, mcts_simulations=args.sims,
+                         record_path=args.record)
+
+
+def _benchmark(args):
+    from src.tools.run_benchmark import (
+        benchmark_imports, benchmark_search, benchmark_board_sizes, benchmark_thread_scaling,
+        check_shared_node_budget
+    )
+    imports_ok = benchmark_imports()
+    budget_ok = check_shared_node_budget()
+    if not args.imports_only:
+        benchmark_search(num_simulations=args.sims)
+        benchmark_board_sizes(sizes=args.board_sizes)
+        benchmark_thread_scaling(max_threads=args.threads)
+    return 0 if imports_ok and budget_ok else 1
+
+
+def _serve(args):
+    import asyncio
+    from src.tools.run_game_server import run_game_server
+    try:
+        asyncio.run(run_game_server(host=args.host, port=args.port, max_workers=args.workers,
+                                    max_pending=args.max_pending, move_deadline=args.deadline,
+                                    cache_path=args.cache))
+    except KeyboardInterrupt:
+        print("\nServer dihentikan.")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='logic-gate-ai', description='Logic Gate AI tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    p = subparsers.add_parser('evaluate', help='MCTS vs MCTS (evaluasi standar)')
+    p.add_argument('--games', type=int, default=100)
+    p.add_argument('--sims1', type=int, default=500)
+    p.add_argument('--sims2', type=int, default=500)
+    p.add_argument('--record', help='Tulis log game biner ke path ini')
+    p.add_argument('--record-stats', action='store_true', help='Sertakan statistik pencarian per langkah')
+    p.set_defaults(handler=_evaluate)
+
+    p = subparsers.add_parser('compare', help='Komparasi berbagai jumlah simulasi')
+    p.add_argument('--games', type=int, default=50)
+    p.add_argument('--cache', action='store_true', help='Pakai position cache lintas game')
+    p.add_argument('--record', help='Tulis log game biner (satu file per konfigurasi)')
+    p.set_defaults(handler=_compare)
+
+    p = subparsers.add_parser('openings', help='Evaluasi strategi pembukaan')
+    p.add_argument('--games', type=int, default=100)
+    p.add_argument('--record', help='Tulis log game biner ke path ini')
+    p.add_argument('--replay', action='store_true', help='Hanya analisis log --record tanpa simulasi')
+    p.set_defaults(handler=_openings)
+
+    p = subparsers.add_parser('analyze', help='Analisis log game biner')
+    p.add_argument('paths', nargs='+')
+    p.set_defaults(handler=_analyze)
+
+    p = subparsers.add_parser('difficulty', help='Turnamen tingkat kesulitan')
+    p.add_argument('--games', type=int, default=100)
+    p.add_argument('--cache', action='store_true', help='Pakai position cache lintas game')
+    p.add_argument('--record', help='Tulis log game biner (satu file per match)')
+    p.set_defaults(handler=_difficulty)
+
+    p = subparsers.add_parser('calibrate', help='Kalibrasi tabel kesulitan berdasarkan target win rate')
+    p.add_argument('--games', type=int, default=200, help='Jumlah game per titik pengukuran')
+    p.add_argument('--max-sims', type=int, default=2000)
+    p.add_argument('--workers', type=int, default=None)
+    p.add_argument('--output', default=None, help='Path tabel JSON (default: config.DIFFICULTY_TABLE_PATH)')
+    p.set_defaults(handler=_calibrate)
+
+    p = subparsers.add_parser('keras-compare', help='Keras model vs MCTS')
+    p.add_argument('--model', default='models/logic_gate_ai_selfplay_episode_14000.h5')
+    p.add_argument('--games', type=int, default=100)
+    p.add_argument('--sims', type=int, default=500)
+    p.add_argument('--record', help='Tulis log game biner (satu file per match)')
+    p.set_defaults(handler=_keras_compare)
+
+    p = subparsers.add_parser('benchmark', help='Benchmark waktu import dan kecepatan pencarian')
+    p.add_argument('--sims', type=int, default=500)
+    p.add_argument('--imports-only', action='store_true')
+    p.add_argument('--board-sizes', type=int, nargs='+', default=[5, 6, 7, 8],
+                   help='Jumlah input papan piramida yang dibandingkan')
+    p.add_argument('--threads', type=int, default=None,
+                   help='Jumlah thread maksimum untuk benchmark tree-parallel (default: jumlah CPU)')
+    p.set_defaults(handler=_benchmark)
+
+    p = subparsers.add_parser('serve', help='Jalankan game server asyncio')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--workers', type=int, default=None)
+    p.add_argument('--max-pending', type=int, default=32)
+    p.add_argument('--deadline', type=float, default=10.0)
+    p.add_argument('--cache', default=None, metavar='PATH',
+                   help='File SQLite position cache yang dipakai bersama semua worker')
+    p.set_defaults(handler=_serve)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'replay', False) and not args.record:
+        parser.error('--replay membutuhkan --record PATH')
+    return args.handler(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
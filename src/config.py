@@ -2,11 +2,9 @@ import numpy as np
 import random
 import copy
 import math
+import os
 from collections import defaultdict
 
-NUM_BINARY_SLOTS = 15
-NUM_CARD_SLOTS = 10
-
 CARD_TO_ID = {
     'AND': 1,
     'OR': 2,
@@ -16,4 +14,23 @@ CARD_TO_ID = {
 }
 
 ID_TO_CARD = {v: k for k, v in CARD_TO_ID.items()}
-INITIAL_BINARY_INPUTS = [0, 1, 0, 1, 0]
\ No newline at end of file
+INITIAL_BINARY_INPUTS = [0, 1, 0, 1, 0]
+
+# Tabel kebenaran gate: output untuk input (0,0), (0,1), (1,0), (1,1).
+# Gate di luar CARD_TO_ID bisa dipakai lewat BoardTopology(gates=[...]).
+GATE_TRUTH_TABLES = {
+    'AND': (0, 0, 0, 1),
+    'OR': (0, 1, 1, 1),
+    'NAND': (1, 1, 1, 0),
+    'NOR': (1, 0, 0, 0),
+    'XOR': (0, 1, 1, 0),
+    'XNOR': (1, 0, 0, 1),
+}
+
+# Ukuran papan default (piramida 5-4-3-2-1); papan lain dibangkitkan oleh BoardTopology.
+NUM_BINARY_SLOTS = len(INITIAL_BINARY_INPUTS) * (len(INITIAL_BINARY_INPUTS) + 1) // 2
+NUM_CARD_SLOTS = len(INITIAL_BINARY_INPUTS) * (len(INITIAL_BINARY_INPUTS) - 1) // 2
+
+# Tabel kesulitan hasil kalibrasi (logic-gate-ai calibrate); dimuat saat startup jika ada.
+DIFFICULTY_TABLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'models', 'difficulty_table.json')
\ No newline at end of file
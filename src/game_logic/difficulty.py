@@ -0,0 +1,49 @@
+import json
+import os
+
+from src.config import DIFFICULTY_TABLE_PATH
+from .mcts_agent import MCTSAgent
+from .random_agent import RandomAgent
+
+DEFAULT_DIFFICULTY_LEVELS = {
+    "Easy": {"agent_class": RandomAgent, "params": {}},
+    "Medium": {"agent_class": MCTSAgent, "params": {"num_simulations": 5}},
+    "Hard": {"agent_class": MCTSAgent, "params": {"num_simulations": 25}},
+    "Very Hard": {"agent_class": MCTSAgent, "params": {"num_simulations": 500}},
+}
+
+
+def load_difficulty_table(path=DIFFICULTY_TABLE_PATH):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def apply_difficulty_table(levels, table):
+    # Hanya jumlah simulasi level MCTS yang diganti; level tanpa entri kalibrasi atau yang
+    # targetnya tidak tercapai saat kalibrasi tetap memakai nilai default.
+    levels = {name: {**config, "params": dict(config["params"])} for name, config in levels.items()}
+    if not table:
+        return levels
+
+    for name, entry in table.get("levels", {}).items():
+        if not entry.get("reached", True):
+            continue
+        if name in levels and levels[name]["agent_class"] is MCTSAgent:
+            levels[name]["params"]["num_simulations"] = int(entry["num_simulations"])
+    return levels
+
+
+DIFFICULTY_LEVELS = apply_difficulty_table(DEFAULT_DIFFICULTY_LEVELS, load_difficulty_table())
+
+
+def create_agent(difficulty, player_id, position_cache=None):
+    if difficulty not in DIFFICULTY_LEVELS:
+        raise ValueError(f"Unknown difficulty '{difficulty}', expected one of {list(DIFFICULTY_LEVELS)}")
+
+    config = DIFFICULTY_LEVELS[difficulty]
+    params = {**config["params"], "player_id": player_id}
+    if position_cache is not None and config["agent_class"] is MCTSAgent:
+        params["position_cache"] = position_cache
+    return config["agent_class"](**params)
@@ -0,0 +1,167 @@
+import os
+import struct
+
+import numpy as np
+
+from src.config import GATE_TRUTH_TABLES
+from .topology import BoardTopology, DEFAULT_TOPOLOGY
+
+# Format log biner:
+#   header file (32 byte): magic, versi, max_plies, jumlah kartu, flags, lalu topologi
+#   papan (jumlah input, hand_copies, bitmask input awal, kode gate per kartu)
+#   lalu record game berukuran tetap: winner, panjang, target P1/P2, lalu satu byte
+#   action code per ply (BoardTopology.action_index), sisa ply diisi NO_ACTION.
+# Statistik pencarian per langkah (opsional) ada di file sidecar `<path>.stats`
+# dengan urutan record yang sama, sehingga kedua file bisa di-memmap langsung.
+MAGIC = b'LGGR'
+VERSION = 2
+MAX_GATES = 16
+HEADER = struct.Struct(f'<4sBBBBBBH{MAX_GATES}s4x')
+NO_ACTION = 0xFF
+FLAG_STATS = 0x01
+GATE_CODES = {name: code for code, name in enumerate(GATE_TRUTH_TABLES, start=1)}
+GATE_NAMES = {code: name for name, code in GATE_CODES.items()}
+
+
+def record_dtype(max_plies):
+    return np.dtype([
+        ('winner', 'u1'),
+        ('length', 'u1'),
+        ('p1_target', 'u1'),
+        ('p2_target', 'u1'),
+        ('moves', 'u1', (max_plies,)),
+    ])
+
+
+def stats_dtype(max_plies):
+    return np.dtype([
+        ('visits', '<u4', (max_plies,)),
+        ('win_rate', '<f4', (max_plies,)),
+    ])
+
+
+def pack_game(moves, winner, player1_target=1, player2_target=0, topology=DEFAULT_TOPOLOGY):
+    actions = bytes(topology.action_index(m['slot'], m['card']) for m in moves)
+    padding = bytes([NO_ACTION]) * (topology.num_card_slots - len(actions))
+    return bytes((winner, len(actions), player1_target, player2_target)) + actions + padding
+
+
+def records_from_bytes(data, topology=DEFAULT_TOPOLOGY):
+    return np.frombuffer(data, dtype=record_dtype(topology.num_card_slots))
+
+
+def suffixed_path(path, suffix):
+    base, ext = os.path.splitext(path)
+    return f"{base}_{suffix}{ext}"
+
+
+def pack_header(topology, with_stats=False):
+    if topology.num_inputs > 16 or topology.num_cards > MAX_GATES:
+        raise ValueError(f"{topology} does not fit in the game record header")
+    input_mask = sum(bit << i for i, bit in enumerate(topology.initial_inputs))
+    gate_codes = bytes(GATE_CODES[g] for g in topology.gates)
+    return HEADER.pack(MAGIC, VERSION, topology.num_card_slots, topology.num_cards,
+                       FLAG_STATS if with_stats else 0, topology.num_inputs, topology.hand_copies,
+                       input_mask, gate_codes)
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        data = f.read(HEADER.size)
+    if len(data) < HEADER.size or data[:4] != MAGIC:
+        raise ValueError(f"'{path}' is not a game record file")
+    magic, version, max_plies, num_cards, flags, num_inputs, hand_copies, input_mask, gate_codes = \
+        HEADER.unpack(data)
+    if version != VERSION:
+        raise ValueError(f"Unsupported game record version {version}")
+
+    topology = BoardTopology(initial_inputs=[(input_mask >> i) & 1 for i in range(num_inputs)],
+                             gates=[GATE_NAMES[code] for code in gate_codes[:num_cards]],
+                             hand_copies=hand_copies)
+    return {'max_plies': max_plies, 'num_cards': num_cards, 'has_stats': bool(flags & FLAG_STATS),
+            'topology': topology}
+
+
+class GameRecordWriter:
+    """Menulis game ke log biner secara append; aman dibuka ulang untuk melanjutkan file lama."""
+    def __init__(self, path, with_stats=False, topology=DEFAULT_TOPOLOGY, buffer_games=1024):
+        if topology.action_space_size > NO_ACTION:
+            raise ValueError("Action space does not fit in one byte per ply")
+
+        self.path = path
+        self.topology = topology
+        self.max_plies = topology.num_card_slots
+        self.with_stats = with_stats
+        self.buffer_games = buffer_games
+        self._games = []
+        self._stats = []
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            header = read_header(path)
+            if (header['topology'], header['has_stats']) != (topology, with_stats):
+                raise ValueError(f"'{path}' was written with a different layout: {header}")
+        else:
+            with open(path, 'wb') as f:
+                f.write(pack_header(topology, with_stats))
+            if with_stats:
+                open(self.stats_path, 'wb').close()
+
+    @property
+    def stats_path(self):
+        return self.path + '.stats'
+
+    def write_game(self, moves, winner, player1_target=1, player2_target=0, search_stats=None):
+        self.write_packed(pack_game(moves, winner, player1_target, player2_target, self.topology), search_stats)
+
+    def write_packed(self, record, search_stats=None):
+        self._games.append(record)
+
+        if self.with_stats:
+            stats = np.zeros((), dtype=stats_dtype(self.max_plies))
+            for ply, info in enumerate(search_stats or []):
+                if info:
+                    stats['visits'][ply] = info.get('best_visits', 0)
+                    stats['win_rate'][ply] = info.get('best_win_rate', 0.0)
+            self._stats.append(stats.tobytes())
+
+        if len(self._games) >= self.buffer_games:
+            self.flush()
+
+    def flush(self):
+        if self._games:
+            with open(self.path, 'ab') as f:
+                f.write(b''.join(self._games))
+            self._games = []
+        if self._stats:
+            with open(self.stats_path, 'ab') as f:
+                f.write(b''.join(self._stats))
+            self._stats = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_game_records(path):
+    header = read_header(path)
+    dtype = record_dtype(header['max_plies'])
+    # Record terakhir yang terpotong (mis. proses mati saat flush) diabaikan.
+    num_games = (os.path.getsize(path) - HEADER.size) // dtype.itemsize
+    if num_games == 0:
+        return np.zeros(0, dtype=dtype), header
+    return np.memmap(path, dtype=dtype, mode='r', offset=HEADER.size, shape=(num_games,)), header
+
+
+def load_search_stats(path):
+    header = read_header(path)
+    dtype = stats_dtype(header['max_plies'])
+    stats_path = path + '.stats'
+    num_games = os.path.getsize(stats_path) // dtype.itemsize if header['has_stats'] else 0
+    if num_games == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(stats_path, dtype=dtype, mode='r', shape=(num_games,))
@@ -1,55 +1,455 @@
-from .mcts_node import MCTSNode
+import math
+import random
+import sys
+import threading
+import time
+
+from .mcts_node import MCTSNode, node_lock
+from .node_budget import NodeBudget
+from .position_cache import position_cache_key, unpack_root_stats
 from .state import GameState
 
+def free_threading_active():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
 class MCTSAgent:
-    def __init__(self, num_simulations=1000, player_id=2):
+    def __init__(self, num_simulations=1000, player_id=2, ponder=False, max_ponder_simulations=None,
+                 max_ponder_time=30.0, max_nodes=None, node_budget=None, on_budget_exhausted='prune', prune_fraction=0.1,
+                 position_cache=None, cache_prior_fraction=0.25, num_threads=1, virtual_loss=1):
         self.num_simulations = num_simulations
         self.player_id = player_id
 
-    def select_move(self, game_state: GameState):
+        # Ponder: setelah langkah sendiri dimainkan, pencarian dilanjutkan di thread
+        # background selama lawan berpikir, lalu subtree yang cocok dipakai ulang.
+        # Runner match wajib memanggil discard_tree() setelah game selesai; max_ponder_time
+        # hanya pengaman jika itu terlewat.
+        self.ponder = ponder
+        self.max_ponder_simulations = max_ponder_simulations or num_simulations * 10
+        self.max_ponder_time = max_ponder_time
+        self._saved_root = None
+        self._ponder_thread = None
+        self._ponder_stop = threading.Event()
+
+        # Batas node: 'prune' membuang subtree yang paling jarang dikunjungi,
+        # 'rollout' berhenti ekspansi dan melanjutkan rollout dari leaf yang ada.
+        if on_budget_exhausted not in ('prune', 'rollout'):
+            raise ValueError("on_budget_exhausted must be 'prune' or 'rollout'")
+        if node_budget is None and max_nodes is not None:
+            node_budget = NodeBudget(max_nodes)
+        self.node_budget = node_budget
+        self.on_budget_exhausted = on_budget_exhausted
+        self.prune_fraction = prune_fraction
+        self._tree_nodes = 0
+        self._nodes_pruned = 0
+        self.last_search_info = {}
+
+        # Cache statistik root lintas game (PositionCache / SharedPositionCache). Statistik
+        # cache dipakai sebagai prior (maksimal cache_prior_fraction * num_simulations
+        # kunjungan) yang dihitung ke budget simulasi, jadi cache hit menghemat simulasi
+        # tanpa membuat pencarian menjadi tabel langkah tetap. Hanya kunjungan baru yang
+        # ditambahkan ke cache.
+        self.position_cache = position_cache
+        self.cache_prior_fraction = cache_prior_fraction
+        self._cache_root = None
+        self._cache_baseline = {}
+        self._prior_visits = 0
+
+        # Tree parallelism: beberapa thread berbagi satu pohon dengan virtual loss.
+        # Hanya aktif di build CPython free-threaded; dengan GIL tetap single-thread.
+        self.num_threads = num_threads
+        self.search_threads = num_threads if num_threads > 1 and free_threading_active() else 1
+        self.virtual_loss = max(1, virtual_loss)
+
+    def _new_root(self, game_state):
         root = MCTSNode(game_state.copy())
+        if self.position_cache is not None:
+            data = self.position_cache.get(self._cache_key(root.state))
+            if data:
+                self._warm_start(root, unpack_root_stats(data))
+            self._cache_root = root
+            self._cache_baseline = {_move_key(c.move): (c.visits, c.wins) for c in root.children}
+            self._prior_visits = root.visits
+        return root
+
+    def _cache_key(self, game_state):
+        return position_cache_key(game_state, ('mcts', self.num_simulations, self.player_id))
+
+    def _warm_start(self, root, cached_stats):
+        total = sum(visits for _, visits, _ in cached_stats)
+        cap = int(self.num_simulations * self.cache_prior_fraction)
+        scale = min(1.0, cap / total) if total > 0 else 0.0
+        for move, visits, wins in cached_stats:
+            prior_visits = int(visits * scale)
+            if prior_visits == 0 or move not in root.untried_moves or not self._reserve_node(root):
+                continue
+            child = root.expand_move(move)
+            child.visits = prior_visits
+            child.wins = wins * prior_visits / visits
+            root.visits += child.visits
+            root.wins += child.wins
+            self._tree_nodes += 1
+
+    def _root_prior(self, root):
+        return self._prior_visits if root is self._cache_root else 0
+
+    def _store_root(self, root):
+        # Hanya kunjungan yang belum pernah disimpan (di atas prior / penyimpanan
+        # sebelumnya untuk root yang sama) yang diakumulasikan ke cache.
+        if self.position_cache is None or not root.children:
+            return
+        if root is not self._cache_root:
+            self._cache_root, self._cache_baseline, self._prior_visits = root, {}, 0
+
+        new_stats = []
+        for child in root.children:
+            base_visits, base_wins = self._cache_baseline.get(_move_key(child.move), (0, 0.0))
+            if child.visits > base_visits:
+                new_stats.append((child.move, child.visits - base_visits, child.wins - base_wins))
+        self._cache_baseline = {_move_key(c.move): (c.visits, c.wins) for c in root.children}
+
+        if new_stats:
+            self.position_cache.accumulate(self._cache_key(root.state), new_stats)
+
+    def _reserve_node(self, root, allow_prune=True):
+        if self.node_budget is None:
+            return True
+        if self.node_budget.try_acquire():
+            return True
+        if allow_prune and self.on_budget_exhausted == 'prune' and self._prune(root) > 0:
+            return self.node_budget.try_acquire()
+        return False
+
+    def _prune(self, root):
+        # Anak langsung root tidak pernah dibuang agar statistik pemilihan langkah utuh.
+        candidates = []
+        stack = [child for child in root.children]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                candidates.append(child)
+                stack.append(child)
 
-        for _ in range(self.num_simulations):
-            node = root
+        target = max(1, int(self.node_budget.max_nodes * self.prune_fraction))
+        released = 0
+        for node in sorted(candidates, key=lambda n: n.visits):
+            if released >= target:
+                break
+            if node.parent is not None:
+                released += node.prune()
 
-            while node.is_fully_expanded() and node.children:
-                node = node.best_child()
+        self._tree_nodes -= released
+        self._nodes_pruned += released
+        self.node_budget.release(released)
+        return released
 
+    def _release_tree(self, keep=None):
+        # Node root tidak dihitung; subtree yang dipertahankan menjadi root baru.
+        kept = keep.subtree_size() - 1 if keep is not None else 0
+        if keep is not self._cache_root:
+            self._cache_root, self._cache_baseline, self._prior_visits = None, {}, 0
+        if self.node_budget is not None:
+            self.node_budget.release(self._tree_nodes - kept)
+        self._tree_nodes = kept
+
+    def _run_simulation(self, root):
+        node = root
+        can_expand = self._reserve_node(root)
+
+        while node.children and (node.is_fully_expanded() or not can_expand):
+            node = node.best_child()
+
+        if can_expand:
             if not node.state.is_terminal() and not node.is_fully_expanded():
                 node = node.expand()
+                self._tree_nodes += 1
+            elif self.node_budget is not None:
+                self.node_budget.release(1)
+
+        winner = node.rollout()
+
+        node.backpropagate(winner, self.player_id)
+
+    def _run_simulation_parallel(self, root):
+        # Pruning memindahkan subtree yang mungkin sedang dilalui thread lain, jadi di
+        # mode paralel budget yang habis selalu berarti berhenti ekspansi.
+        virtual_loss = self.virtual_loss
+        can_expand = self._reserve_node(root, allow_prune=False)
+        expanded = False
+
+        node = root
+        with node_lock(node):
+            node.virtual_loss += virtual_loss
+
+        while True:
+            with node_lock(node):
+                if node.children and (node.is_fully_expanded() or not can_expand):
+                    next_node = node.best_child()
+                elif can_expand and not node.state.is_terminal() and not node.is_fully_expanded():
+                    next_node = node.expand(virtual_loss)
+                    expanded = True
+                else:
+                    next_node = None
+
+            if next_node is None:
+                break
+            if not expanded:
+                with node_lock(next_node):
+                    next_node.virtual_loss += virtual_loss
+            node = next_node
+            if expanded:
+                break
+
+        if can_expand and not expanded and self.node_budget is not None:
+            self.node_budget.release(1)
+
+        winner = node.rollout()
+
+        node.backpropagate_parallel(winner, self.player_id, virtual_loss)
+        return expanded
+
+    def _run_parallel(self, root, simulations, stop=None):
+        claimed = [0]
+        claim_lock = threading.Lock()
+        expanded_counts = []
+
+        def worker():
+            expanded = 0
+            while True:
+                with claim_lock:
+                    if claimed[0] >= simulations or (stop is not None and stop.is_set()):
+                        break
+                    claimed[0] += 1
+                expanded += self._run_simulation_parallel(root)
+            with claim_lock:
+                expanded_counts.append(expanded)
+
+        threads = [threading.Thread(target=worker) for _ in range(self.search_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self._tree_nodes += sum(expanded_counts)
+
+    def _search(self, root, simulations, report_every=None, report_interval=None, stop=None):
+        # Inti pencarian bersama untuk select_move dan analisis streaming: yield root
+        # setiap report_every simulasi atau report_interval detik. `stop` (threading.Event)
+        # menghentikan pencarian di antara simulasi.
+        if self.search_threads > 1:
+            yield from self._search_parallel(root, simulations, report_every, report_interval, stop)
+            return
 
-            winner = node.rollout()
+        last_report = time.perf_counter()
+        for i in range(1, simulations + 1):
+            if stop is not None and stop.is_set():
+                return
+            self._run_simulation(root)
 
-            node.backpropagate(winner, self.player_id)
+            if report_every and i % report_every == 0:
+                last_report = time.perf_counter()
+                yield root
+            elif report_interval and time.perf_counter() - last_report >= report_interval:
+                last_report = time.perf_counter()
+                yield root
+
+    def _search_parallel(self, root, simulations, report_every=None, report_interval=None, stop=None):
+        if report_every:
+            chunk = report_every
+        elif report_interval:
+            chunk = self.search_threads * 16
+        else:
+            chunk = simulations
+
+        done = 0
+        last_report = time.perf_counter()
+        while done < simulations:
+            if stop is not None and stop.is_set():
+                return
+            count = min(chunk, simulations - done)
+            self._run_parallel(root, count, stop)
+            done += count
+
+            if report_every:
+                yield root
+            elif report_interval and time.perf_counter() - last_report >= report_interval:
+                last_report = time.perf_counter()
+                yield root
+
+    def select_move(self, game_state: GameState):
+        root = self._take_saved_tree(game_state) or self._new_root(game_state)
+        self._nodes_pruned = 0
+        prior_visits = self._root_prior(root)
+        simulations = max(0, self.num_simulations - root.visits)
+
+        for _ in self._search(root, simulations):
+            pass
+
+        self._store_root(root)
+
+        if not root.children:
+            return self._fallback_move(root, simulations)
 
         best_child = max(root.children, key=lambda c: c.visits)
+        self.last_search_info = {
+            'simulations': simulations,
+            'reused_visits': root.visits - simulations - prior_visits,
+            'prior_visits': prior_visits,
+            'nodes_used': self._tree_nodes + 1,
+            'nodes_pruned': self._nodes_pruned,
+            'best_visits': best_child.visits,
+            'best_win_rate': best_child.wins / best_child.visits,
+        }
+
+        if self.ponder and not best_child.state.is_terminal():
+            self._release_tree(keep=best_child)
+            self._start_pondering(best_child)
+        else:
+            self._release_tree()
+
         return best_child.move
 
-    def get_move_statistics(self, game_state):
-        root = MCTSNode(game_state.copy())
+    def _fallback_move(self, root, simulations):
+        # NodeBudget bersama sudah habis dipakai pohon lain sebelum root sempat
+        # diekspansi (pruning hanya bisa membebaskan node pohon sendiri).
+        self.last_search_info = {
+            'simulations': simulations,
+            'reused_visits': 0,
+            'prior_visits': 0,
+            'nodes_used': self._tree_nodes + 1,
+            'nodes_pruned': self._nodes_pruned,
+            'best_visits': 0,
+            'best_win_rate': 0.0,
+            'budget_exhausted': True,
+        }
+        self._release_tree()
+        return random.choice(root.state.get_valid_moves())
 
-        for _ in range(self.num_simulations):
-            node = root
+    def _start_pondering(self, root):
+        root.parent = None
+        self._saved_root = root
+        self._ponder_stop.clear()
+        self._ponder_thread = threading.Thread(target=self._ponder_loop, args=(root,), daemon=True)
+        self._ponder_thread.start()
 
-            while node.is_fully_expanded() and node.children:
-                node = node.best_child()
+    def _ponder_loop(self, root):
+        deadline = time.monotonic() + self.max_ponder_time if self.max_ponder_time else None
+        while not self._ponder_stop.is_set() and root.visits < self.max_ponder_simulations:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            self._run_simulation(root)
 
-            if not node.state.is_terminal() and not node.is_fully_expanded():
-                node = node.expand()
+    def _stop_ponder_thread(self):
+        if self._ponder_thread is not None:
+            self._ponder_stop.set()
+            self._ponder_thread.join()
+            self._ponder_thread = None
+
+    def discard_tree(self):
+        self._stop_ponder_thread()
+        self._saved_root = None
+        self._release_tree()
+
+    def stop_pondering(self):
+        self.discard_tree()
+
+    def _take_saved_tree(self, game_state):
+        self._stop_ponder_thread()
+        root, self._saved_root = self._saved_root, None
+        if root is None:
+            return None
 
-            winner = node.rollout()
-            node.backpropagate(winner, self.player_id)
+        position = game_state.position_key()
+        if root.state.position_key() == position:
+            return root
 
+        for child in root.children:
+            if child.state.position_key() == position:
+                child.parent = None
+                self._release_tree(keep=child)
+                return child
+
+        self._release_tree()
+        return None
+
+    def iter_move_statistics(self, game_state, num_simulations=None, every=100, interval_ms=None, stop=None):
+        """Yield statistik per langkah setiap `every` simulasi atau `interval_ms` milidetik.
+
+        Pohon hasil analisis disimpan, sehingga select_move berikutnya pada posisi yang
+        sama melanjutkan pencarian ini alih-alih mengulang dari nol.
+        """
+        root = self._take_saved_tree(game_state) or self._new_root(game_state)
+        simulations = max(0, (num_simulations or self.num_simulations) - root.visits)
+        interval = interval_ms / 1000.0 if interval_ms else None
+
+        try:
+            last_visits = None
+            for _ in self._search(root, simulations, report_every=every, report_interval=interval, stop=stop):
+                last_visits = root.visits
+                yield self._root_statistics(root)
+
+            if last_visits != root.visits:
+                yield self._root_statistics(root)
+        finally:
+            self._store_root(root)
+            self._saved_root = root
+
+    async def astream_move_statistics(self, game_state, num_simulations=None, every=100, interval_ms=None):
+        import asyncio
+
+        # Generator hanya boleh ditutup setelah thread yang sedang menjalankan next()
+        # selesai; saat consumer dibatalkan, pencarian dihentikan lewat `stop` lalu ditunggu.
+        stop = threading.Event()
+        stream = self.iter_move_statistics(game_state, num_simulations, every, interval_ms, stop=stop)
+        pending = None
+        try:
+            while True:
+                pending = asyncio.ensure_future(asyncio.to_thread(next, stream, None))
+                stats = await asyncio.shield(pending)
+                if stats is None:
+                    break
+                yield stats
+        finally:
+            stop.set()
+            if pending is not None and not pending.done():
+                await asyncio.wait([pending])
+            stream.close()
+
+    def get_move_statistics(self, game_state):
+        stats = []
+        for stats in self.iter_move_statistics(game_state, every=None):
+            pass
+        return stats
+
+    def _root_statistics(self, root):
+        id_to_card = root.state.topology.id_to_card
         stats = []
         for child in root.children:
             win_rate = child.wins / child.visits if child.visits > 0 else 0
+            ci_low, ci_high = _wilson_interval(child.wins, child.visits)
             stats.append({
                 'move': child.move,
                 'visits': child.visits,
                 'wins': child.wins,
                 'win_rate': win_rate,
-                'card': ID_TO_CARD.get(child.move['card'], 'Unknown'),
+                'ci_low': ci_low,
+                'ci_high': ci_high,
+                'card': id_to_card.get(child.move['card'], 'Unknown'),
                 'slot': child.move['slot']
             })
 
-        return sorted(stats, key=lambda x: x['visits'], reverse=True)
\ No newline at end of file
+        return sorted(stats, key=lambda x: x['visits'], reverse=True)
+
+
+def _move_key(move):
+    return int(move['slot']), int(move['card'])
+
+
+def _wilson_interval(wins, visits, z=1.96):
+    if visits == 0:
+        return 0.0, 1.0
+    p = wins / visits
+    denominator = 1 + z * z / visits
+    center = (p + z * z / (2 * visits)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / visits + z * z / (4 * visits * visits)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
\ No newline at end of file
@@ -2,8 +2,17 @@ import numpy as np
 import random
 import math
 import copy
+import threading
 from .state import GameState
 
+# Lock bergaris (striped) untuk pencarian multi-thread: satu lock per node terlalu boros
+# memori, jadi node dipetakan ke salah satu dari sejumlah kecil lock berdasarkan id().
+_NODE_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+
+def node_lock(node):
+    return _NODE_LOCKS[(id(node) >> 4) % len(_NODE_LOCKS)]
+
 class MCTSNode:
     def __init__(self, state: GameState, parent=None, move=None):
         self.state = state
@@ -12,23 +21,35 @@ class MCTSNode:
         self.children = []
         self.visits = 0
         self.wins = 0
+        self.virtual_loss = 0
         self.untried_moves = state.get_valid_moves()
 
     def is_fully_expanded(self):
         return len(self.untried_moves) == 0
 
     def best_child(self, c_param=1.41):
+        # Virtual loss dihitung sebagai kunjungan tanpa kemenangan; selalu 0 di mode single-thread.
+        parent_visits = self.visits + self.virtual_loss
         choices_weights = [
-            (child.wins / child.visits) + c_param * math.sqrt(2 * math.log(self.visits) / child.visits)
+            (child.wins / (child.visits + child.virtual_loss)) +
+            c_param * math.sqrt(2 * math.log(parent_visits) / (child.visits + child.virtual_loss))
             for child in self.children
         ]
         return self.children[np.argmax(choices_weights)]
 
-    def expand(self):
+    def expand(self, virtual_loss=0):
         move = self.untried_moves.pop(random.randint(0, len(self.untried_moves) - 1))
+        return self._add_child(move, virtual_loss)
+
+    def expand_move(self, move):
+        self.untried_moves.remove(move)
+        return self._add_child(move)
+
+    def _add_child(self, move, virtual_loss=0):
         next_state = self.state.copy()
         next_state.apply_move(move)
         child_node = MCTSNode(next_state, parent=self, move=move)
+        child_node.virtual_loss = virtual_loss
         self.children.append(child_node)
         return child_node
 
@@ -52,4 +73,43 @@ class MCTSNode:
             self.wins += 0.5
 
         if self.parent:
-            self.parent.backpropagate(result, player_perspective)
\ No newline at end of file
+            self.parent.backpropagate(result, player_perspective)
+
+    def backpropagate_parallel(self, result, player_perspective, virtual_loss):
+        node = self
+        while node is not None:
+            with node_lock(node):
+                node.visits += 1
+                node.virtual_loss -= virtual_loss
+                if result == player_perspective:
+                    node.wins += 1
+                elif result == 0:
+                    node.wins += 0.5
+            node = node.parent
+
+    def subtree_size(self):
+        size = 0
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            size += 1
+            stack.extend(node.children)
+        return size
+
+    def prune(self):
+        # Lepas subtree dari parent dan putus referensi parent<->children supaya
+        # memori langsung dibebaskan tanpa menunggu cyclic GC.
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent.untried_moves.append(self.move)
+            self.parent = None
+
+        released = 0
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            released += 1
+            stack.extend(node.children)
+            node.children = []
+            node.parent = None
+        return released
@@ -0,0 +1,24 @@
+import threading
+
+class NodeBudget:
+    """Batas jumlah node MCTS. Satu instance bisa dibagi ke banyak agent/pencarian."""
+    def __init__(self, max_nodes):
+        if max_nodes <= 0:
+            raise ValueError("max_nodes must be positive")
+        self.max_nodes = max_nodes
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, count=1):
+        with self._lock:
+            if self.used + count > self.max_nodes:
+                return False
+            self.used += count
+            return True
+
+    def release(self, count):
+        with self._lock:
+            self.used = max(0, self.used - count)
+
+    def available(self):
+        return self.max_nodes - self.used
@@ -0,0 +1,198 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+# Satu record statistik anak root: slot (u1), card (u1), visits (u4), wins (f4).
+_MOVE_STATS = struct.Struct('<BBIf')
+
+
+def position_cache_key(game_state, agent_config):
+    payload = pickle.dumps((game_state.position_key(), agent_config), protocol=4)
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def pack_root_stats(stats):
+    return b''.join(
+        _MOVE_STATS.pack(int(move['slot']), int(move['card']), visits, wins)
+        for move, visits, wins in stats if visits > 0
+    )
+
+
+def unpack_root_stats(data):
+    return [
+        ({'slot': slot, 'card': card}, visits, wins)
+        for slot, card, visits, wins in _MOVE_STATS.iter_unpack(data)
+    ]
+
+
+def merge_root_stats(data, new_stats):
+    # Kunjungan baru ditambahkan ke entri lama sehingga statistik terakumulasi lintas game.
+    merged = {}
+    for move, visits, wins in unpack_root_stats(data or b''):
+        merged[(move['slot'], move['card'])] = [visits, wins]
+    for move, visits, wins in new_stats:
+        entry = merged.setdefault((int(move['slot']), int(move['card'])), [0, 0.0])
+        entry[0] = min(entry[0] + visits, 0xFFFFFFFF)
+        entry[1] += wins
+    return pack_root_stats(({'slot': slot, 'card': card}, visits, wins)
+                           for (slot, card), (visits, wins) in merged.items())
+
+
+class PositionCache:
+    """Cache LRU statistik root MCTS lintas game, dibatasi jumlah entri dan/atau byte."""
+    def __init__(self, max_entries=100_000, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            self._put(key, data)
+
+    def accumulate(self, key, new_stats):
+        with self._lock:
+            self._put(key, merge_root_stats(self._entries.get(key), new_stats))
+
+    def _put(self, key, data):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._entries[key] = data
+        self._bytes += len(data)
+
+        while self._entries and (len(self._entries) > self.max_entries or
+                                 (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate(),
+        }
+
+
+class SharedPositionCache:
+    """Varian PositionCache berbasis file SQLite yang aman dipakai banyak proses worker.
+
+    Koneksi dibuka ulang per proses sehingga instance bisa di-pickle ke ProcessPoolExecutor.
+    Counter hit/miss bersifat lokal per proses.
+    """
+    def __init__(self, path, max_entries=1_000_000, evict_fraction=0.1):
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_fraction = evict_fraction
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn = None
+        self._pid = None
+        self._puts = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        state['_pid'] = None
+        return state
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS position_stats ('
+                'key BLOB PRIMARY KEY, data BLOB NOT NULL, last_used REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_last_used ON position_stats (last_used)')
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key):
+        conn = self._connection()
+        row = conn.execute('SELECT data FROM position_stats WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        conn.execute('UPDATE position_stats SET last_used = ? WHERE key = ?', (time.time(), key))
+        self.hits += 1
+        return row[0]
+
+    def put(self, key, data):
+        conn = self._connection()
+        conn.execute('INSERT OR REPLACE INTO position_stats (key, data, last_used) VALUES (?, ?, ?)',
+                     (key, data, time.time()))
+        self._maybe_evict(conn)
+
+    def accumulate(self, key, new_stats):
+        # BEGIN IMMEDIATE mengunci database untuk tulis sehingga read-merge-write dari
+        # beberapa worker tidak saling menimpa.
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT data FROM position_stats WHERE key = ?', (key,)).fetchone()
+            conn.execute('INSERT OR REPLACE INTO position_stats (key, data, last_used) VALUES (?, ?, ?)',
+                         (key, merge_root_stats(row[0] if row else None, new_stats), time.time()))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self._maybe_evict(conn)
+
+    def _maybe_evict(self, conn):
+        # Cek ukuran tabel secara berkala saja; eviction dilakukan per batch.
+        self._puts += 1
+        if self._puts % 256 == 0:
+            self._evict(conn)
+
+    def _evict(self, conn):
+        (count,) = conn.execute('SELECT COUNT(*) FROM position_stats').fetchone()
+        if count <= self.max_entries:
+            return
+        excess = count - self.max_entries + int(self.max_entries * self.evict_fraction)
+        cursor = conn.execute('DELETE FROM position_stats WHERE key IN '
+                              '(SELECT key FROM position_stats ORDER BY last_used LIMIT ?)', (excess,))
+        self.evictions += cursor.rowcount
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def stats(self):
+        (count,) = self._connection().execute('SELECT COUNT(*) FROM position_stats').fetchone()
+        return {
+            'entries': count,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate(),
+        }
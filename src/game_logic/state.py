@@ -1,51 +1,37 @@
 import numpy as np
-import copy
-from src.config import *
+from .topology import DEFAULT_TOPOLOGY
 
 class GameState:
-    def __init__(self, player1_target=1, player2_target=0):
-        self.binary_slots = np.full(NUM_BINARY_SLOTS, -1)
-        self.binary_slots[:len(INITIAL_BINARY_INPUTS)] = INITIAL_BINARY_INPUTS
-        self.card_slots = np.zeros(NUM_CARD_SLOTS)
-        self.player1_hand = list(CARD_TO_ID.values())
-        self.player2_hand = list(CARD_TO_ID.values())
+    def __init__(self, player1_target=1, player2_target=0, topology=None):
+        self.topology = topology or DEFAULT_TOPOLOGY
+        self.binary_slots = np.full(self.topology.num_binary_slots, -1)
+        self.binary_slots[:self.topology.num_inputs] = self.topology.initial_inputs
+        self.card_slots = np.zeros(self.topology.num_card_slots)
+        self.player1_hand = list(self.topology.hand)
+        self.player2_hand = list(self.topology.hand)
         self.player1_target = player1_target
         self.player2_target = player2_target
         self.current_player = 1
 
     def _get_input_binary_indices(self, slot_idx):
-        if 0 <= slot_idx <= 3:
-            return slot_idx, slot_idx + 1
-        elif 4 <= slot_idx <= 6:
-            base = 5
-            offset = slot_idx - 4
-            return base + offset, base + offset + 1
-        elif 7 <= slot_idx <= 8:
-            base = 9
-            offset = slot_idx - 7
-            return base + offset, base + offset + 1
-        elif slot_idx == 9:
-            return 12, 13
+        return self.topology.slot_inputs[slot_idx]
 
     def _get_output_binary_index(self, slot_idx):
-        if 0 <= slot_idx <= 3:
-            return 5 + slot_idx
-        elif 4 <= slot_idx <= 6:
-            return 9 + (slot_idx - 4)
-        elif 7 <= slot_idx <= 8:
-            return 12 + (slot_idx - 7)
-        elif slot_idx == 9:
-            return 14
+        return self.topology.slot_outputs[slot_idx]
 
     def get_valid_moves(self):
         moves = []
         hand = self.player1_hand if self.current_player == 1 else self.player2_hand
-        empty_slots = [i for i, slot in enumerate(self.card_slots) if slot == 0]
+        cards = list(dict.fromkeys(hand))
+        binary_slots = self.binary_slots
+        slot_inputs = self.topology.slot_inputs
 
-        for slot in empty_slots:
-            idx1, idx2 = self._get_input_binary_indices(slot)
-            if self.binary_slots[idx1] != -1 and self.binary_slots[idx2] != -1:
-                for card in hand:
+        for slot, card_slot in enumerate(self.card_slots):
+            if card_slot != 0:
+                continue
+            idx1, idx2 = slot_inputs[slot]
+            if binary_slots[idx1] != -1 and binary_slots[idx2] != -1:
+                for card in cards:
                     moves.append({'slot': slot, 'card': card})
         return moves
 
@@ -56,8 +42,8 @@ class GameState:
         hand.remove(card)
         self.card_slots[slot] = card
 
-        idx1, idx2 = self._get_input_binary_indices(slot)
-        output_idx = self._get_output_binary_index(slot)
+        idx1, idx2 = self.topology.slot_inputs[slot]
+        output_idx = self.topology.slot_outputs[slot]
         input_val1 = self.binary_slots[idx1]
         input_val2 = self.binary_slots[idx2]
 
@@ -65,22 +51,13 @@ class GameState:
         self.current_player = 2 if self.current_player == 1 else 1
 
     def _calculate_logic(self, card_id, a, b):
-        if card_id == CARD_TO_ID['AND']:
-            return int(a and b)
-        elif card_id == CARD_TO_ID['OR']:
-            return int(a or b)
-        elif card_id == CARD_TO_ID['NAND']:
-            return int(not (a and b))
-        elif card_id == CARD_TO_ID['NOR']:
-            return int(not (a or b))
-        elif card_id == CARD_TO_ID['XOR']:
-            return int(a != b)
+        return self.topology.truth_table[card_id][a][b]
 
     def is_terminal(self):
-        return self.binary_slots[NUM_BINARY_SLOTS - 1] != -1 and len(self.get_valid_moves()) == 0
+        return self.binary_slots[self.topology.output_index] != -1 and len(self.get_valid_moves()) == 0
 
     def get_winner(self):
-        final_value = self.binary_slots[NUM_BINARY_SLOTS - 1]
+        final_value = self.binary_slots[self.topology.output_index]
         if final_value == -1:
             return 0
         if final_value == self.player1_target:
@@ -90,5 +67,27 @@ class GameState:
         else:
             return 0
 
+    def position_key(self):
+        return (
+            self.binary_slots.tobytes(),
+            self.card_slots.tobytes(),
+            tuple(sorted(self.player1_hand)),
+            tuple(sorted(self.player2_hand)),
+            self.player1_target,
+            self.player2_target,
+            self.current_player,
+            self.topology.signature,
+        )
+
     def copy(self):
-        return copy.deepcopy(self)
\ No newline at end of file
+        # Topologi bersifat read-only dan dipakai bersama; deepcopy hanya untuk data state.
+        new_state = GameState.__new__(GameState)
+        new_state.topology = self.topology
+        new_state.binary_slots = self.binary_slots.copy()
+        new_state.card_slots = self.card_slots.copy()
+        new_state.player1_hand = list(self.player1_hand)
+        new_state.player2_hand = list(self.player2_hand)
+        new_state.player1_target = self.player1_target
+        new_state.player2_target = self.player2_target
+        new_state.current_player = self.current_player
+        return new_state
\ No newline at end of file
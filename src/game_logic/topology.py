@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+
+from src.config import CARD_TO_ID, GATE_TRUTH_TABLES, INITIAL_BINARY_INPUTS
+
+
+class BoardTopology:
+    """Geometri papan piramida beserta tabel wiring yang dibangkitkan sekali di awal.
+
+    Baris binary berukuran n, n-1, ..., 1; slot kartu di antara dua baris membaca dua
+    binary bertetangga dan menulis ke baris berikutnya. Semua kode state, langkah dan
+    agent membaca tabel di sini alih-alih if-chain per ukuran papan.
+    """
+    def __init__(self, initial_inputs=INITIAL_BINARY_INPUTS, gates=tuple(CARD_TO_ID), hand_copies=None):
+        if len(initial_inputs) < 2:
+            raise ValueError("A board needs at least two inputs")
+        unknown = [g for g in gates if g not in GATE_TRUTH_TABLES]
+        if unknown:
+            raise ValueError(f"Unknown gate types {unknown}, expected any of {list(GATE_TRUTH_TABLES)}")
+
+        self.initial_inputs = tuple(int(v) for v in initial_inputs)
+        self.gates = tuple(gates)
+        self.num_inputs = len(self.initial_inputs)
+        self.card_to_id = {name: i + 1 for i, name in enumerate(self.gates)}
+        self.id_to_card = {v: k for k, v in self.card_to_id.items()}
+        self.num_cards = len(self.gates)
+
+        slot_inputs = []
+        slot_outputs = []
+        row_start, row_len = 0, self.num_inputs
+        while row_len > 1:
+            next_start = row_start + row_len
+            for offset in range(row_len - 1):
+                slot_inputs.append((row_start + offset, row_start + offset + 1))
+                slot_outputs.append(next_start + offset)
+            row_start, row_len = next_start, row_len - 1
+
+        self.num_binary_slots = row_start + 1
+        self.num_card_slots = len(slot_inputs)
+        self.output_index = self.num_binary_slots - 1
+
+        # Tuple untuk jalur panas per-langkah, array numpy untuk pemakaian tervektorisasi.
+        self.slot_inputs = tuple(slot_inputs)
+        self.slot_outputs = tuple(slot_outputs)
+        self.slot_input_array = np.array(slot_inputs, dtype=np.intp)
+        self.slot_output_array = np.array(slot_outputs, dtype=np.intp)
+
+        # truth_table[card_id][a][b]; indeks 0 dicadangkan untuk slot kosong.
+        self.truth_table = ((None, None),) + tuple(
+            ((table[0], table[1]), (table[2], table[3]))
+            for table in (GATE_TRUTH_TABLES[g] for g in self.gates)
+        )
+
+        # Setiap pemain harus punya cukup kartu agar semua slot bisa terisi.
+        if hand_copies is None:
+            hand_copies = math.ceil(self.num_card_slots / (2 * self.num_cards))
+        self.hand_copies = hand_copies
+        self.hand = tuple(card_id for _ in range(hand_copies) for card_id in self.id_to_card)
+
+        self.action_space_size = self.num_card_slots * self.num_cards
+        self.state_vector_size = self.num_binary_slots + self.num_card_slots + 2 * self.num_cards + 1
+        self.signature = (self.initial_inputs, self.gates, self.hand_copies)
+
+    @classmethod
+    def pyramid(cls, num_inputs, pattern=None, gates=tuple(CARD_TO_ID), hand_copies=None):
+        initial_inputs = pattern if pattern is not None else [i % 2 for i in range(num_inputs)]
+        if len(initial_inputs) != num_inputs:
+            raise ValueError(f"Input pattern has {len(initial_inputs)} values, expected {num_inputs}")
+        return cls(initial_inputs, gates, hand_copies)
+
+    def action_index(self, slot, card_id):
+        return slot * self.num_cards + card_id - 1
+
+    def action_to_move(self, action):
+        return {'slot': action // self.num_cards, 'card': action % self.num_cards + 1}
+
+    def __eq__(self, other):
+        return isinstance(other, BoardTopology) and self.signature == other.signature
+
+    def __hash__(self):
+        return hash(self.signature)
+
+    def __repr__(self):
+        return f"BoardTopology(inputs={list(self.initial_inputs)}, gates={list(self.gates)})"
+
+
+DEFAULT_TOPOLOGY = BoardTopology()
@@ -0,0 +1,343 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.game_logic.state import GameState
+from src.game_logic.difficulty import DIFFICULTY_LEVELS, create_agent
+
+
+class ServerBusyError(Exception):
+    """Dilempar ketika antrian pencarian agent sudah penuh (backpressure)."""
+
+
+def _search_move(difficulty, player_id, game_state, position_cache=None):
+    agent = create_agent(difficulty, player_id, position_cache=position_cache)
+    return agent.select_move(game_state)
+
+
+def state_to_dict(game_state):
+    id_to_card = game_state.topology.id_to_card
+    return {
+        'binary_slots': [int(v) for v in game_state.binary_slots],
+        'card_slots': [id_to_card.get(int(c)) for c in game_state.card_slots],
+        'player1_hand': [id_to_card[c] for c in game_state.player1_hand],
+        'player2_hand': [id_to_card[c] for c in game_state.player2_hand],
+        'current_player': game_state.current_player,
+        'is_terminal': bool(game_state.is_terminal()),
+        'winner': int(game_state.get_winner()) if game_state.is_terminal() else None,
+    }
+
+
+class GameSession:
+    def __init__(self, difficulty, human_player=1):
+        self.session_id = uuid.uuid4().hex
+        self.difficulty = difficulty
+        self.human_player = human_player
+        self.ai_player = 2 if human_player == 1 else 1
+        self.state = GameState(player1_target=1, player2_target=0)
+        self.moves = []
+        self.lock = asyncio.Lock()
+        self.last_active = time.monotonic()
+
+
+class GameServer:
+    """Menyimpan banyak sesi game di memori dan mengirim pencarian agent ke process pool.
+
+    Event loop hanya menangani I/O dan langkah manusia; setiap `select_move`
+    berjalan di worker process sehingga pencarian "Very Hard" tidak menahan sesi lain.
+    """
+
+    def __init__(self, max_workers=None, max_pending=32, move_deadline=10.0,
+                 max_sessions=1000, latency_window=1000, session_timeout=1800.0, position_cache=None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.move_deadline = move_deadline
+        self.max_sessions = max_sessions
+        # Sesi tanpa aktivitas selama session_timeout detik dihapus; klien yang putus
+        # tanpa `close` tidak boleh menghabiskan kuota max_sessions selamanya.
+        self.session_timeout = session_timeout
+        self._expiry_task = None
+        # Opsional: SharedPositionCache yang dipakai bersama oleh semua worker process.
+        self.position_cache = position_cache
+
+        self.sessions = {}
+        self.executor = None
+        self.pending = 0
+        self.counters = {
+            'moves_completed': 0,
+            'moves_rejected': 0,
+            'moves_timed_out': 0,
+            'moves_failed': 0,
+            'sessions_expired': 0,
+        }
+        self.latencies = deque(maxlen=latency_window)
+
+    def start_executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self.max_workers = self.executor._max_workers
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        self.start_executor()
+        if self.session_timeout and self._expiry_task is None:
+            self._expiry_task = asyncio.create_task(self._expire_sessions_loop())
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    def shutdown(self):
+        if self._expiry_task is not None:
+            self._expiry_task.cancel()
+            self._expiry_task = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def create_session(self, difficulty, human_player=1):
+        if difficulty not in DIFFICULTY_LEVELS:
+            raise ValueError(f"Unknown difficulty '{difficulty}'")
+        if human_player not in (1, 2):
+            raise ValueError("human_player must be 1 or 2")
+        if len(self.sessions) >= self.max_sessions:
+            self.expire_idle_sessions()
+        if len(self.sessions) >= self.max_sessions:
+            raise ServerBusyError("Session limit reached")
+
+        session = GameSession(difficulty, human_player)
+        self.sessions[session.session_id] = session
+
+        if session.ai_player == session.state.current_player:
+            try:
+                async with session.lock:
+                    await self._play_ai_move(session)
+            except BaseException:
+                self.close_session(session.session_id)
+                raise
+        return session
+
+    def get_session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise KeyError(f"Unknown session '{session_id}'")
+        session.last_active = time.monotonic()
+        return session
+
+    def close_session(self, session_id):
+        self.sessions.pop(session_id, None)
+
+    def expire_idle_sessions(self):
+        if not self.session_timeout:
+            return 0
+        cutoff = time.monotonic() - self.session_timeout
+        # Sesi yang sedang menunggu pencarian agent (lock dipegang) tidak dihapus.
+        expired = [sid for sid, session in self.sessions.items()
+                   if session.last_active < cutoff and not session.lock.locked()]
+        for session_id in expired:
+            self.close_session(session_id)
+        self.counters['sessions_expired'] += len(expired)
+        return len(expired)
+
+    async def _expire_sessions_loop(self):
+        while True:
+            await asyncio.sleep(max(1.0, self.session_timeout / 4))
+            self.expire_idle_sessions()
+
+    async def play_move(self, session_id, move):
+        session = self.get_session(session_id)
+        async with session.lock:
+            state = session.state
+            if state.is_terminal():
+                raise ValueError("Game is already finished")
+            if state.current_player != session.human_player:
+                raise ValueError("It is not the human player's turn")
+            if move not in state.get_valid_moves():
+                raise ValueError(f"Invalid move {move}")
+
+            state.apply_move(move)
+            session.moves.append(move)
+
+            if not state.is_terminal():
+                await self._play_ai_move(session)
+        return session
+
+    async def request_ai_move(self, session_id):
+        session = self.get_session(session_id)
+        async with session.lock:
+            state = session.state
+            if not state.is_terminal() and state.current_player == session.ai_player:
+                await self._play_ai_move(session)
+        return session
+
+    async def _play_ai_move(self, session):
+        move = await self.search(session.difficulty, session.ai_player, session.state)
+        session.state.apply_move(move)
+        session.moves.append(move)
+
+    async def search(self, difficulty, player_id, game_state, deadline=None):
+        if self.pending >= self.max_pending:
+            self.counters['moves_rejected'] += 1
+            raise ServerBusyError(f"Search queue full ({self.pending}/{self.max_pending})")
+
+        self.start_executor()
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+
+        # Slot antrian dilepas saat worker benar-benar selesai (atau future dibatalkan
+        # sebelum jalan), bukan saat deadline habis, agar backpressure tetap akurat.
+        self.pending += 1
+        future = self.executor.submit(_search_move, difficulty, player_id, game_state.copy(), self.position_cache)
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release_slot))
+
+        try:
+            move = await asyncio.wait_for(asyncio.wrap_future(future),
+                                          timeout=deadline or self.move_deadline)
+        except asyncio.TimeoutError:
+            self.counters['moves_timed_out'] += 1
+            raise
+        except Exception:
+            self.counters['moves_failed'] += 1
+            raise
+
+        if move is None:
+            self.counters['moves_failed'] += 1
+            raise RuntimeError("Agent failed to select a move")
+
+        self.latencies.append(time.perf_counter() - started)
+        self.counters['moves_completed'] += 1
+        return move
+
+    def _release_slot(self):
+        self.pending -= 1
+
+    def metrics(self):
+        latencies = np.array(self.latencies) * 1000.0
+        if len(latencies) > 0:
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            latency = {'p50_ms': float(p50), 'p90_ms': float(p90), 'p99_ms': float(p99),
+                       'max_ms': float(latencies.max())}
+        else:
+            latency = {'p50_ms': None, 'p90_ms': None, 'p99_ms': None, 'max_ms': None}
+
+        workers = self.max_workers or 0
+        return {
+            'sessions': len(self.sessions),
+            'pending_searches': self.pending,
+            'queue_depth': max(0, self.pending - workers),
+            'max_pending': self.max_pending,
+            'workers': workers,
+            'move_latency': latency,
+            **self.counters,
+        }
+
+    def _session_payload(self, session):
+        return {
+            'session_id': session.session_id,
+            'difficulty': session.difficulty,
+            'human_player': session.human_player,
+            'moves': [{'slot': int(m['slot']), 'card': session.state.topology.id_to_card[m['card']]}
+                      for m in session.moves],
+            'state': state_to_dict(session.state),
+        }
+
+    async def dispatch(self, request):
+        # Semua field divalidasi di sini dan hanya melempar ValueError / KeyError,
+        # sehingga exception lain dari server tidak dilaporkan sebagai kesalahan klien.
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        cmd = request.get('cmd')
+
+        if cmd == 'new_game':
+            session = await self.create_session(_field(request, 'difficulty', str, 'Hard'),
+                                                _field(request, 'human_player', int, 1))
+            return self._session_payload(session)
+        elif cmd == 'move':
+            session_id = _field(request, 'session_id', str)
+            session = self.get_session(session_id)
+            move = {'slot': _field(request, 'slot', int),
+                    'card': _parse_card(_field(request, 'card', (str, int)), session.state.topology)}
+            session = await self.play_move(session_id, move)
+            return self._session_payload(session)
+        elif cmd == 'ai_move':
+            session = await self.request_ai_move(_field(request, 'session_id', str))
+            return self._session_payload(session)
+        elif cmd == 'state':
+            return self._session_payload(self.get_session(_field(request, 'session_id', str)))
+        elif cmd == 'close':
+            self.close_session(_field(request, 'session_id', str))
+            return {}
+        elif cmd == 'metrics':
+            return self.metrics()
+        else:
+            raise ValueError(f"Unknown command '{cmd}'")
+
+    async def handle_client(self, reader, writer):
+        # Protokol: satu objek JSON per baris, dibalas satu objek JSON per baris.
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial
+                except asyncio.LimitOverrunError as e:
+                    line = None
+                    await _discard_line(reader, e.consumed)
+                if line is not None and not line:
+                    break
+
+                try:
+                    if line is None:
+                        raise ValueError("Request line too long")
+                    response = {'ok': True, **await self.dispatch(json.loads(line))}
+                except ServerBusyError as e:
+                    response = {'ok': False, 'error': 'busy', 'detail': str(e)}
+                except asyncio.TimeoutError:
+                    response = {'ok': False, 'error': 'deadline_exceeded'}
+                except (KeyError, ValueError) as e:
+                    response = {'ok': False, 'error': 'bad_request', 'detail': str(e)}
+                except RuntimeError as e:
+                    response = {'ok': False, 'error': 'search_failed', 'detail': str(e)}
+
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def _discard_line(reader, consumed):
+    # Buang sisa baris yang melebihi limit stream sampai newline berikutnya agar
+    # request selanjutnya tetap sinkron.
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+        except asyncio.IncompleteReadError:
+            return
+
+
+_REQUIRED = object()
+
+
+def _field(request, name, kind, default=_REQUIRED):
+    value = request.get(name, default)
+    if value is _REQUIRED:
+        raise ValueError(f"Missing field '{name}'")
+    # bool adalah subclass int di Python, tetapi bukan nilai slot/pemain yang valid.
+    if not isinstance(value, kind) or isinstance(value, bool):
+        raise ValueError(f"Field '{name}' has invalid value {value!r}")
+    return value
+
+
+def _parse_card(card, topology):
+    if isinstance(card, str):
+        if card.upper() not in topology.card_to_id:
+            raise ValueError(f"Unknown card '{card}'")
+        return topology.card_to_id[card.upper()]
+    return card
@@ -4,15 +4,28 @@ import sys
 import os
 
 def setup_python_path():
-    try:
-        from src.game_logic.state import GameState
-    except ImportError:
-        sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    # Hanya perlu saat tool dijalankan langsung sebagai script; lewat entry point
+    # `logic-gate-ai` paket `src` sudah ter-import dan fungsi ini tidak melakukan apa-apa.
+    if 'src' in sys.modules:
+        return
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
 
 setup_python_path()
 from src.game_logic.state import GameState
-
-def evaluate_two_agents(num_games=100, agent1=None, agent2=None, show_progress=True):
+from src.game_logic.game_record import GameRecordWriter
+
+def end_game(*agents):
+    # Hentikan pondering dan buang pohon yang disimpan; tanpa ini thread ponder tetap
+    # memakai CPU setelah game selesai dan mengganggu timing game berikutnya.
+    for agent in agents:
+        discard_tree = getattr(agent, 'discard_tree', None)
+        if discard_tree is not None:
+            discard_tree()
+
+def evaluate_two_agents(num_games=100, agent1=None, agent2=None, show_progress=True,
+                        record_path=None, record_search_stats=False):
     if agent1 is None or agent2 is None:
         raise ValueError("Both agent1 and agent2 must be provided")
 
@@ -32,6 +45,8 @@ def evaluate_two_agents(num_games=100, agent1=None, agent2=None, show_progress=T
     print(f"Player 2 (Target=0): {agent2_name}")
     print(f"{'='*70}\n")
 
+    game_log = GameRecordWriter(record_path, with_stats=record_search_stats) if record_path else None
+
     start_time = time.time()
     for game_num in range(num_games):
         if show_progress and (game_num + 1) % 5 == 0:
@@ -40,16 +55,16 @@ def evaluate_two_agents(num_games=100, agent1=None, agent2=None, show_progress=T
 
         game = GameState(player1_target=1, player2_target=0)
         move_count = 0
+        moves = []
+        search_stats = []
 
         while not game.is_terminal():
             valid_moves = game.get_valid_moves()
             if not valid_moves:
                 break
 
-            if game.current_player == 1:
-                move = agent1.select_move(game)
-            else:
-                move = agent2.select_move(game)
+            agent = agent1 if game.current_player == 1 else agent2
+            move = agent.select_move(game)
 
             if move is None:
                 print(f"\nError: Agent {game.current_player} failed to select a move. Game set as draw.")
@@ -58,8 +73,14 @@ def evaluate_two_agents(num_games=100, agent1=None, agent2=None, show_progress=T
 
             game.apply_move(move)
             move_count += 1
+            moves.append(move)
+            search_stats.append(getattr(agent, 'last_search_info', None))
         else:
             winner = game.get_winner()
+        end_game(agent1, agent2)
+
+        if game_log is not None:
+            game_log.write_game(moves, winner, game.player1_target, game.player2_target, search_stats)
 
         if winner == 1:
             results['p1_wins'] += 1
@@ -70,6 +91,9 @@ def evaluate_two_agents(num_games=100, agent1=None, agent2=None, show_progress=T
 
         results['game_lengths'].append(move_count)
 
+    if game_log is not None:
+        game_log.close()
+
     end_time = time.time()
     total_time = end_time - start_time
     if show_progress:
@@ -0,0 +1,112 @@
+import sys
+
+import numpy as np
+
+try:
+    from .evaluation_utils import setup_python_path
+except ImportError:
+    from evaluation_utils import setup_python_path
+
+setup_python_path()
+
+from src.game_logic.game_record import load_game_records, load_search_stats
+
+
+def win_rates(records):
+    num_games = len(records)
+    if num_games == 0:
+        return {'games': 0, 'p1_win_rate': 0, 'p2_win_rate': 0, 'draw_rate': 0}
+
+    counts = np.bincount(records['winner'], minlength=3)
+    return {
+        'games': num_games,
+        'p1_win_rate': counts[1] / num_games,
+        'p2_win_rate': counts[2] / num_games,
+        'draw_rate': counts[0] / num_games,
+    }
+
+
+def opening_statistics(records, topology):
+    played = records[records['length'] > 0]
+    openings = played['moves'][:, 0].astype(np.int64)
+    action_space = int(openings.max()) + 1 if len(openings) else 0
+
+    frequency = np.bincount(openings, minlength=action_space)
+    p1_wins = np.bincount(openings, weights=played['winner'] == 1, minlength=action_space)
+    p2_wins = np.bincount(openings, weights=played['winner'] == 2, minlength=action_space)
+
+    stats = []
+    for action in np.flatnonzero(frequency):
+        freq = int(frequency[action])
+        move = topology.action_to_move(int(action))
+        stats.append({
+            'action': int(action),
+            'slot': move['slot'],
+            'card': topology.id_to_card.get(move['card'], str(move['card'])),
+            'frequency': freq,
+            'share': freq / len(played),
+            'p1_win_rate': p1_wins[action] / freq,
+            'p2_win_rate': p2_wins[action] / freq,
+        })
+    return sorted(stats, key=lambda x: x['frequency'], reverse=True)
+
+
+def game_length_distribution(records, max_plies):
+    return np.bincount(records['length'], minlength=max_plies + 1)
+
+
+def display_opening_statistics(openings):
+    print(f"{'Opening Move':<20} | {'Frequency':<12} | {'Win Rate':<10}")
+    print(f"{'-'*50}")
+
+    for opening in openings:
+        move = f"Slot {opening['slot']} - {opening['card']}"
+        print(f"{move:<20} | {opening['frequency']:>4} ({opening['share']:>5.1%}) | {opening['p1_win_rate']:>8.1%}")
+
+
+def analyze_game_log(path):
+    records, header = load_game_records(path)
+    num_games = len(records)
+
+    print(f"\n{'='*70}")
+    print(f"📼 ANALISIS LOG GAME: {path}")
+    print(f"{'='*70}\n")
+
+    rates = win_rates(records)
+    print(f"Total game: {num_games}")
+    print(f"  P1 win: {rates['p1_win_rate']:.1%} | P2 win: {rates['p2_win_rate']:.1%} | Draw: {rates['draw_rate']:.1%}\n")
+
+    if num_games == 0:
+        return
+
+    print("🎲 PEMBUKAAN:")
+    openings = opening_statistics(records, header['topology'])
+    display_opening_statistics(openings)
+
+    print("\n📏 DISTRIBUSI PANJANG GAME:")
+    lengths = game_length_distribution(records, header['max_plies'])
+    for length in np.flatnonzero(lengths):
+        share = lengths[length] / num_games
+        print(f"  {length:>2} moves: {'█' * int(share * 50)} {share:.1%}")
+
+    if header['has_stats']:
+        search_stats = load_search_stats(path)
+        plies = np.arange(header['max_plies'])
+        played = plies[None, :] < records['length'][:len(search_stats), None]
+        visits = np.where(played, search_stats['visits'], 0)
+        win_rate = np.where(played, search_stats['win_rate'], 0)
+        per_ply = np.maximum(played.sum(axis=0), 1)
+
+        print("\n🔍 STATISTIK PENCARIAN PER PLY (rata-rata langkah terpilih):")
+        for ply in plies[played.any(axis=0)]:
+            print(f"  Ply {ply + 1:>2}: {visits[:, ply].sum() / per_ply[ply]:>8.1f} visits | "
+                  f"win rate {win_rate[:, ply].sum() / per_ply[ply]:.1%}")
+
+    print(f"\n{'='*70}\n")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python game_record_analyzer.py <game_log.bin>")
+        sys.exit(1)
+    analyze_game_log(sys.argv[1])
@@ -0,0 +1,192 @@
+import os
+import random
+import subprocess
+import sys
+import time
+
+try:
+    from .evaluation_utils import setup_python_path
+except ImportError:
+    from evaluation_utils import setup_python_path
+
+setup_python_path()
+
+from src.game_logic.state import GameState
+from src.game_logic.mcts_agent import MCTSAgent, free_threading_active
+from src.game_logic.node_budget import NodeBudget
+from src.game_logic.topology import BoardTopology
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+
+# Batas waktu import (detik) di interpreter baru. `src.cli` hanya boleh memuat argparse;
+# tool MCTS sudah termasuk numpy sehingga batasnya lebih longgar.
+IMPORT_TIME_BUDGET = {
+    'src.cli': 0.05,
+    'src.game_logic.mcts_agent': 0.4,
+    'src.tools.run_mcts_evaluation': 0.5,
+}
+
+
+def measure_import_time(module, repeat=3):
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def benchmark_imports(budget=None):
+    budget = budget or IMPORT_TIME_BUDGET
+
+    print(f"\n{'='*70}")
+    print("⏱️  BENCHMARK WAKTU IMPORT")
+    print(f"{'='*70}")
+    print(f"{'Module':<35} | {'Waktu':<10} | {'Budget':<10} | Status")
+    print(f"{'-'*70}")
+
+    all_ok = True
+    for module, limit in budget.items():
+        elapsed = measure_import_time(module)
+        ok = elapsed <= limit
+        all_ok = all_ok and ok
+        print(f"{module:<35} | {elapsed*1000:>7.1f}ms | {limit*1000:>7.1f}ms | {'✅' if ok else '❌'}")
+
+    print(f"{'='*70}\n")
+    return all_ok
+
+
+def benchmark_search(num_simulations=500, num_positions=5):
+    print(f"\n{'='*70}")
+    print(f"🔥 BENCHMARK PENCARIAN MCTS ({num_simulations} simulasi x {num_positions} posisi)")
+    print(f"{'='*70}")
+
+    start = time.perf_counter()
+    agent = MCTSAgent(num_simulations=num_simulations, player_id=1)
+    game = GameState(player1_target=1, player2_target=0)
+    first_move_time = None
+
+    for _ in range(num_positions):
+        if game.is_terminal():
+            game = GameState(player1_target=1, player2_target=0)
+        agent.player_id = game.current_player
+        game.apply_move(agent.select_move(game))
+        if first_move_time is None:
+            first_move_time = time.perf_counter() - start
+
+    elapsed = time.perf_counter() - start
+    sims_per_sec = num_simulations * num_positions / elapsed
+    print(f"Langkah pertama:   {first_move_time*1000:.1f}ms")
+    print(f"Total waktu:       {elapsed:.2f}s")
+    print(f"Simulasi/detik:    {sims_per_sec:,.0f}")
+    print(f"{'='*70}\n")
+
+    return {'first_move_time': first_move_time, 'elapsed': elapsed, 'sims_per_sec': sims_per_sec}
+
+
+def benchmark_board_sizes(sizes=(5, 6, 7, 8), num_simulations=200, num_random_games=200):
+    print(f"\n{'='*90}")
+    print(f"📐 BENCHMARK UKURAN PAPAN ({num_simulations} simulasi MCTS dari posisi awal)")
+    print(f"{'='*90}")
+    print(f"{'Inputs':<7} | {'Slots':<6} | {'Actions':<8} | {'Random game':<12} | {'MCTS move':<11} | {'Simulasi/detik':<14}")
+    print(f"{'-'*90}")
+
+    results = []
+    for num_inputs in sizes:
+        topology = BoardTopology.pyramid(num_inputs)
+
+        start = time.perf_counter()
+        for _ in range(num_random_games):
+            game = GameState(topology=topology)
+            while not game.is_terminal():
+                game.apply_move(random.choice(game.get_valid_moves()))
+        random_game_time = (time.perf_counter() - start) / num_random_games
+
+        agent = MCTSAgent(num_simulations=num_simulations, player_id=1)
+        start = time.perf_counter()
+        agent.select_move(GameState(topology=topology))
+        search_time = time.perf_counter() - start
+
+        results.append({
+            'num_inputs': num_inputs,
+            'card_slots': topology.num_card_slots,
+            'action_space': topology.action_space_size,
+            'random_game_time': random_game_time,
+            'search_time': search_time,
+            'sims_per_sec': num_simulations / search_time,
+        })
+        print(f"{num_inputs:<7} | {topology.num_card_slots:<6} | {topology.action_space_size:<8} | "
+              f"{random_game_time*1000:>9.2f}ms | {search_time*1000:>8.1f}ms | {num_simulations / search_time:>14,.0f}")
+
+    print(f"{'='*90}\n")
+    return results
+
+
+def benchmark_thread_scaling(max_threads=None, num_simulations=2000):
+    max_threads = max_threads or os.cpu_count() or 1
+    free_threading = free_threading_active()
+
+    print(f"\n{'='*70}")
+    print(f"🧵 BENCHMARK TREE-PARALLEL MCTS ({num_simulations} simulasi)")
+    print(f"Free-threaded build: {'ya' if free_threading else 'tidak (GIL aktif, fallback single-thread)'}")
+    print(f"{'='*70}")
+    print(f"{'Threads':<8} | {'Efektif':<8} | {'Waktu':<10} | {'Simulasi/detik':<14} | Speedup")
+    print(f"{'-'*70}")
+
+    results = []
+    baseline = None
+    for num_threads in range(1, max_threads + 1):
+        agent = MCTSAgent(num_simulations=num_simulations, player_id=1, num_threads=num_threads)
+        start = time.perf_counter()
+        agent.select_move(GameState(player1_target=1, player2_target=0))
+        elapsed = time.perf_counter() - start
+
+        sims_per_sec = num_simulations / elapsed
+        baseline = baseline or sims_per_sec
+        results.append({'threads': num_threads, 'effective_threads': agent.search_threads,
+                        'elapsed': elapsed, 'sims_per_sec': sims_per_sec})
+        print(f"{num_threads:<8} | {agent.search_threads:<8} | {elapsed*1000:>7.1f}ms | "
+              f"{sims_per_sec:>14,.0f} | {sims_per_sec / baseline:>5.2f}x")
+
+    print(f"{'='*70}\n")
+    return results
+
+
+def check_shared_node_budget(num_simulations=50):
+    # Regresi: agent yang berbagi NodeBudget yang sudah habis tetap harus mengembalikan
+    # langkah valid, baik dengan mode 'prune' maupun 'rollout'.
+    print(f"\n{'='*70}")
+    print("🧮 CEK NODE BUDGET BERSAMA")
+    print(f"{'='*70}")
+
+    all_ok = True
+    for mode in ('prune', 'rollout'):
+        budget = NodeBudget(5)
+        budget.try_acquire(5)
+        game = GameState()
+        try:
+            move = MCTSAgent(num_simulations, player_id=1, node_budget=budget,
+                             on_budget_exhausted=mode).select_move(game)
+            ok = move in game.get_valid_moves() and budget.used == 5
+            detail = f"langkah {move}"
+        except Exception as e:
+            ok, detail = False, repr(e)
+        all_ok = all_ok and ok
+        print(f"Budget habis ({mode:<7}) | {detail} | {'✅' if ok else '❌'}")
+
+    print(f"{'='*70}\n")
+    return all_ok
+
+
+if __name__ == "__main__":
+    print("Menjalankan Mode Benchmark...")
+    imports_ok = benchmark_imports()
+    budget_ok = check_shared_node_budget()
+    benchmark_search()
+    benchmark_board_sizes()
+    benchmark_thread_scaling()
+    sys.exit(0 if imports_ok and budget_ok else 1)
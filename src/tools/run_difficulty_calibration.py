@@ -0,0 +1,185 @@
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .evaluation_utils import setup_python_path, end_game
+except ImportError:
+    from evaluation_utils import setup_python_path, end_game
+
+setup_python_path()
+
+from src.config import DIFFICULTY_TABLE_PATH
+from src.game_logic.state import GameState
+from src.game_logic.mcts_agent import MCTSAgent
+
+REFERENCE_AGENT_CONFIG = {
+    "name": "Hard (25 Sims)",
+    "params": {"num_simulations": 25}
+}
+
+# Win rate target (seri dihitung 0.5) melawan agent referensi.
+TARGET_WIN_RATES = {
+    "Medium": 0.25,
+    "Hard": 0.50,
+    "Very Hard": 0.75,
+}
+
+
+def _play_match_batch(candidate_sims, reference_sims, num_games, candidate_player, seed):
+    # Sengaja tanpa position cache: referensi harus lawan yang tetap dan tabel hasilnya
+    # dipakai agent yang juga berjalan tanpa cache.
+    random.seed(seed)
+    reference_player = 2 if candidate_player == 1 else 1
+    candidate = MCTSAgent(num_simulations=candidate_sims, player_id=candidate_player)
+    reference = MCTSAgent(num_simulations=reference_sims, player_id=reference_player)
+
+    wins = draws = moves = 0
+    search_time = 0.0
+    for _ in range(num_games):
+        game = GameState(player1_target=1, player2_target=0)
+        while not game.is_terminal():
+            if game.current_player == candidate_player:
+                start = time.perf_counter()
+                move = candidate.select_move(game)
+                search_time += time.perf_counter() - start
+                moves += 1
+            else:
+                move = reference.select_move(game)
+            game.apply_move(move)
+
+        end_game(candidate, reference)
+        winner = game.get_winner()
+        if winner == candidate_player:
+            wins += 1
+        elif winner == 0:
+            draws += 1
+
+    return wins, draws, num_games, search_time, moves
+
+
+def measure_win_rate(executor, candidate_sims, reference_sims, num_games, num_workers, seed=0):
+    # Game dibagi rata antara bermain sebagai P1 dan P2, lalu dipecah per worker.
+    batches = []
+    per_side = max(1, num_games // 2)
+    chunk = max(1, per_side // num_workers)
+    for candidate_player in (1, 2):
+        remaining = per_side
+        while remaining > 0:
+            size = min(chunk, remaining)
+            batches.append((candidate_sims, reference_sims, size, candidate_player, seed + len(batches)))
+            remaining -= size
+
+    wins = draws = games = moves = 0
+    search_time = 0.0
+    for w, d, g, t, m in executor.map(_play_match_batch, *zip(*batches)):
+        wins, draws, games, search_time, moves = wins + w, draws + d, games + g, search_time + t, moves + m
+
+    return {
+        'num_simulations': candidate_sims,
+        'win_rate': (wins + 0.5 * draws) / games,
+        'games': games,
+        'ms_per_move': search_time / moves * 1000 if moves else 0.0,
+    }
+
+
+def calibrate_level(executor, target, reference_sims, num_games, num_workers, max_simulations=2000,
+                    tolerance=0.1, measurements=None, min_simulations=1):
+    """Binary search jumlah simulasi terkecil (>= min_simulations) yang mencapai win rate target.
+
+    Mengembalikan (hasil pengukuran, apakah target tercapai).
+    """
+    measurements = {} if measurements is None else measurements
+
+    def measure(sims):
+        if sims not in measurements:
+            measurements[sims] = measure_win_rate(executor, sims, reference_sims, num_games, num_workers,
+                                                  seed=sims * 7919)
+            result = measurements[sims]
+            print(f"  sims={sims:<5} win rate={result['win_rate']:.1%} ({result['ms_per_move']:.1f}ms/langkah)")
+        return measurements[sims]
+
+    low, high = min_simulations, max_simulations
+    if low > high or measure(high)['win_rate'] < target:
+        print(f"  ⚠️  Target {target:.0%} tidak tercapai sampai {max_simulations} simulasi")
+        return measure(high), False
+    if measure(low)['win_rate'] >= target:
+        return measure(low), True
+
+    # Invariant: low gagal mencapai target, high berhasil. Berhenti saat rentang
+    # relatif cukup sempit karena estimasi win rate sendiri punya noise.
+    while high - low > 1 and high > low * (1 + tolerance):
+        mid = (low + high) // 2
+        if measure(mid)['win_rate'] >= target:
+            high = mid
+        else:
+            low = mid
+
+    return measure(high), True
+
+
+def run_difficulty_calibration(num_games=200, max_simulations=2000, num_workers=None,
+                               output_path=DIFFICULTY_TABLE_PATH, targets=None):
+    targets = targets or TARGET_WIN_RATES
+    num_workers = num_workers or os.cpu_count() or 1
+    reference_sims = REFERENCE_AGENT_CONFIG["params"]["num_simulations"]
+
+    print("\n" + "🎯"*35)
+    print("KALIBRASI TINGKAT KESULITAN AI")
+    print(f"Referensi: {REFERENCE_AGENT_CONFIG['name']} | {num_games} games per titik | {num_workers} workers")
+    print("🎯"*35 + "\n")
+
+    levels = {}
+    measurements = {}
+    start = time.time()
+    # Level diproses dari target terendah; level berikutnya wajib memakai simulasi lebih
+    # banyak agar noise pengukuran tidak membuat level yang lebih sulit justru lebih murah.
+    min_simulations = 1
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        for name, target in sorted(targets.items(), key=lambda item: item[1]):
+            print(f"\n--- {name}: target win rate {target:.0%} ---")
+            result, reached = calibrate_level(executor, target, reference_sims, num_games, num_workers,
+                                              max_simulations=max_simulations, measurements=measurements,
+                                              min_simulations=min_simulations)
+            levels[name] = {
+                'target_win_rate': target,
+                'num_simulations': result['num_simulations'],
+                'measured_win_rate': result['win_rate'],
+                'ms_per_move': result['ms_per_move'],
+                'reached': reached,
+            }
+            min_simulations = result['num_simulations'] + 1
+
+    table = {
+        'reference': REFERENCE_AGENT_CONFIG,
+        'games_per_point': num_games,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'levels': levels,
+    }
+    if output_path:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'w') as f:
+            json.dump(table, f, indent=2)
+
+    print("\n" + "="*70)
+    print("📊 TABEL KESULITAN HASIL KALIBRASI")
+    print("="*70)
+    print(f"{'Difficulty':<12} | {'Target':<8} | {'Simulasi':<9} | {'Win Rate':<9} | {'ms/langkah':<10} | Status")
+    print("-" * 70)
+    for name, entry in levels.items():
+        status = '✅' if entry['reached'] else '❌ tidak tercapai (tidak dipakai)'
+        print(f"{name:<12} | {entry['target_win_rate']:<8.0%} | {entry['num_simulations']:<9} | "
+              f"{entry['measured_win_rate']:<9.1%} | {entry['ms_per_move']:<10.1f} | {status}")
+    print("="*70)
+    print(f"Selesai dalam {time.time() - start:.1f}s")
+    if output_path:
+        print(f"💾 Disimpan ke {output_path} (dimuat otomatis oleh DIFFICULTY_LEVELS)")
+
+    return table
+
+
+if __name__ == "__main__":
+    print("Menjalankan Mode Kalibrasi Tingkat Kesulitan AI...")
+    run_difficulty_calibration()
@@ -12,32 +12,29 @@ setup_python_path()
 
 from src.game_logic.state import GameState
 from src.game_logic.mcts_agent import MCTSAgent
-from src.game_logic.random_agent import RandomAgent
+from src.game_logic.difficulty import DIFFICULTY_LEVELS, create_agent
+from src.game_logic.position_cache import PositionCache
+from src.game_logic.game_record import suffixed_path
 from src.config import ID_TO_CARD
 
-DIFFICULTY_LEVELS = {
-    "Easy": {"agent_class": RandomAgent, "params": {}},
-    "Medium": {"agent_class": MCTSAgent, "params": {"num_simulations": 5}},
-    "Hard": {"agent_class": MCTSAgent, "params": {"num_simulations": 25}},
-    "Very Hard": {"agent_class": MCTSAgent, "params": {"num_simulations": 500}},
-}
-
 BASELINE_AGENT_CONFIG = {
     "name": "Hard (25 Sims)",
     "class": MCTSAgent,
     "params": {"num_simulations": 25}
 }
 
-if __name__ == "__main__":
-    print("Menjalankan Mode Evaluasi Tingkat Kesulitan AI...")
-
-    NUM_EVAL_GAMES = 100
+def run_difficulty_tournament(num_games=100, use_position_cache=False, record_path=None):
     summary_results = []
 
+    position_cache = PositionCache(max_entries=200_000) if use_position_cache else None
+    baseline_params = dict(BASELINE_AGENT_CONFIG["params"])
+    if position_cache is not None:
+        baseline_params["position_cache"] = position_cache
+
     print("\n" + "🏆"*35)
     print(f"TURNAMEN TINGKAT KESULITAN AI")
     print(f"Semua level akan diadu melawan baseline: {BASELINE_AGENT_CONFIG['name']}")
-    print(f"Jumlah Game per Match: {NUM_EVAL_GAMES}")
+    print(f"Jumlah Game per Match: {num_games}")
     print("🏆"*35 + "\n")
 
     for diff_name, diff_config in DIFFICULTY_LEVELS.items():
@@ -46,37 +43,36 @@ if __name__ == "__main__":
         print("#"*70)
 
         print(f"\n--- Match 1: {diff_name} (Player 1) vs Baseline (Player 2) ---")
-        agent_p1_params = {**diff_config["params"], "player_id": 1}
-        agent_p1 = diff_config["agent_class"](**agent_p1_params)
-        agent_p2_params = {**BASELINE_AGENT_CONFIG["params"], "player_id": 2}
-        agent_p2 = BASELINE_AGENT_CONFIG["class"](**agent_p2_params)
+        agent_p1 = create_agent(diff_name, player_id=1, position_cache=position_cache)
+        agent_p2 = BASELINE_AGENT_CONFIG["class"](**baseline_params, player_id=2)
 
+        level_key = diff_name.lower().replace(' ', '_')
         results1 = evaluate_two_agents(
-            num_games=NUM_EVAL_GAMES,
+            num_games=num_games,
             agent1=agent_p1,
             agent2=agent_p2,
-            show_progress=True
+            show_progress=True,
+            record_path=suffixed_path(record_path, f"{level_key}_p1") if record_path else None
         )
         display_evaluation_results(results1, agent1_name=f"{diff_name} (P1)", agent2_name="Baseline (P2)")
 
         print(f"\n--- Match 2: Baseline (Player 1) vs {diff_name} (Player 2) ---")
-        agent_p1_params_match2 = {**BASELINE_AGENT_CONFIG["params"], "player_id": 1}
-        agent_p1_match2 = BASELINE_AGENT_CONFIG["class"](**agent_p1_params_match2)
-        agent_p2_params_match2 = {**diff_config["params"], "player_id": 2}
-        agent_p2_match2 = diff_config["agent_class"](**agent_p2_params_match2)
+        agent_p1_match2 = BASELINE_AGENT_CONFIG["class"](**baseline_params, player_id=1)
+        agent_p2_match2 = create_agent(diff_name, player_id=2, position_cache=position_cache)
 
         results2 = evaluate_two_agents(
-            num_games=NUM_EVAL_GAMES,
+            num_games=num_games,
             agent1=agent_p1_match2,
             agent2=agent_p2_match2,
-            show_progress=True
+            show_progress=True,
+            record_path=suffixed_path(record_path, f"{level_key}_p2") if record_path else None
         )
         display_evaluation_results(results2, agent1_name="Baseline (P1)", agent2_name=f"{diff_name} (P2)")
 
         total_wins = results1['p1_wins'] + results2['p2_wins']
         total_losses = results1['p2_wins'] + results2['p1_wins']
         total_draws = results1['draws'] + results2['draws']
-        total_games = (NUM_EVAL_GAMES * 2)
+        total_games = (num_games * 2)
         
         summary_results.append({
             "Difficulty": diff_name,
@@ -90,14 +86,26 @@ if __name__ == "__main__":
     print("📊 RINGKASAN KESELURUHAN TURNAMEN")
     print(f"(Melawan Baseline: {BASELINE_AGENT_CONFIG['name']})")
     print("="*70)
-    print(f"{'Difficulty':<12} | {'Win Rate':<10} | {'Wins':<6} | {'Losses':<6} | {'Draws':<6} | (Total {NUM_EVAL_GAMES * 2} Games)")
+    print(f"{'Difficulty':<12} | {'Win Rate':<10} | {'Wins':<6} | {'Losses':<6} | {'Draws':<6} | (Total {num_games * 2} Games)")
     print("-" * 70)
     
     for res in summary_results:
         print(f"{res['Difficulty']:<12} | {res['Win Rate']:<10.1%} | {res['Wins']:<6} | {res['Losses']:<6} | {res['Draws']:<6} |")
         
     print("="*70)
+    if position_cache is not None:
+        cache_stats = position_cache.stats()
+        print(f"🗄️  Position cache: {cache_stats['entries']} entri, hit rate {cache_stats['hit_rate']:.1%}")
+        print("⚠️  Dengan position cache sebagian kunjungan tiap langkah berasal dari prior cache;")
+        print("   hasil ini tidak bisa dibandingkan langsung dengan run tanpa cache.")
     print("💡 INSIGHT: Win rate harusnya meningkat seiring dengan naiknya tingkat kesulitan.")
     print("   - 'Easy' harusnya sangat rendah (mendekati 0%).")
     print("   - 'Hard' harusnya sekitar 50% (karena melawan dirinya sendiri).")
     print("   - 'Very Hard' harusnya > 50%.")
+
+    return summary_results
+
+
+if __name__ == "__main__":
+    print("Menjalankan Mode Evaluasi Tingkat Kesulitan AI...")
+    run_difficulty_tournament()
\ No newline at end of file
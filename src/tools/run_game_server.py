@@ -0,0 +1,40 @@
+import asyncio
+
+try:
+    from .evaluation_utils import setup_python_path
+except ImportError:
+    from evaluation_utils import setup_python_path
+
+setup_python_path()
+
+from src.server.game_server import GameServer
+from src.game_logic.position_cache import SharedPositionCache
+
+
+async def run_game_server(host='127.0.0.1', port=8765, max_workers=None, max_pending=32, move_deadline=10.0,
+                          cache_path=None):
+    position_cache = SharedPositionCache(cache_path) if cache_path else None
+    game_server = GameServer(max_workers=max_workers, max_pending=max_pending, move_deadline=move_deadline,
+                             position_cache=position_cache)
+    server = await game_server.serve(host, port)
+
+    print(f"\n{'='*70}")
+    print(f"🎮 GAME SERVER berjalan di {host}:{port}")
+    print(f"Workers: {game_server.max_workers} | Max antrian: {max_pending} | Deadline: {move_deadline}s")
+    if position_cache is not None:
+        print(f"Position cache: {cache_path} (dipakai bersama semua worker)")
+    print(f"{'='*70}\n")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        game_server.shutdown()
+
+
+if __name__ == "__main__":
+    print("Menjalankan Game Server...")
+    try:
+        asyncio.run(run_game_server())
+    except KeyboardInterrupt:
+        print("\nServer dihentikan.")
@@ -1,4 +1,3 @@
-import tensorflow as tf
 import numpy as np
 import os
 import sys
@@ -13,23 +12,23 @@ setup_python_path()
 
 from src.game_logic.state import GameState
 from src.game_logic.mcts_agent import MCTSAgent
-from src.config import ID_TO_CARD, CARD_TO_ID, NUM_BINARY_SLOTS, NUM_CARD_SLOTS
-
-print("TensorFlow version:", tf.__version__)
+from src.game_logic.game_record import suffixed_path
+from src.config import ID_TO_CARD
 
 def state_to_vector(game_state):
+    topology = game_state.topology
     binary_vector = game_state.binary_slots.astype(np.float32)
     card_slots_vector = game_state.card_slots.astype(np.float32)
 
-    p1_hand_vector = np.zeros(len(CARD_TO_ID), dtype=np.float32)
+    p1_hand_vector = np.zeros(topology.num_cards, dtype=np.float32)
     for card_id in game_state.player1_hand:
-        if 1 <= card_id <= 5:
-            p1_hand_vector[card_id - 1] = 1.0
+        if 1 <= card_id <= topology.num_cards:
+            p1_hand_vector[card_id - 1] += 1.0
 
-    p2_hand_vector = np.zeros(len(CARD_TO_ID), dtype=np.float32)
+    p2_hand_vector = np.zeros(topology.num_cards, dtype=np.float32)
     for card_id in game_state.player2_hand:
-        if 1 <= card_id <= 5:
-            p2_hand_vector[card_id - 1] = 1.0
+        if 1 <= card_id <= topology.num_cards:
+            p2_hand_vector[card_id - 1] += 1.0
 
     player_vector = np.array([1.0 if game_state.current_player == 1 else -1.0], dtype=np.float32)
 
@@ -37,13 +36,15 @@ def state_to_vector(game_state):
         binary_vector, card_slots_vector, p1_hand_vector, p2_hand_vector, player_vector
     ])
 
-    if state_vector.shape[0] != 36:
-        raise ValueError(f"State vector length is {state_vector.shape[0]}, expected 36")
+    if state_vector.shape[0] != topology.state_vector_size:
+        raise ValueError(f"State vector length is {state_vector.shape[0]}, expected {topology.state_vector_size}")
     return state_vector
 
 
 class KerasAgent:
     def __init__(self, model_path, player_id):
+        import tensorflow as tf
+
         self.model = tf.keras.models.load_model(model_path, compile=False)
         self.player_id = player_id
         print(f"Keras model loaded from {model_path} for Player {player_id}")
@@ -58,8 +59,9 @@ class KerasAgent:
         input_tensor = np.expand_dims(state_vec, axis=0)
         predictions = self.model.predict(input_tensor, verbose=0)[0]
 
-        if predictions.shape[0] != 50:
-            raise ValueError(f"Model output size is {predictions.shape[0]}, expected 50")
+        topology = game_state.topology
+        if predictions.shape[0] != topology.action_space_size:
+            raise ValueError(f"Model output size is {predictions.shape[0]}, expected {topology.action_space_size}")
 
         best_move = None
         max_score = -np.inf
@@ -68,8 +70,8 @@ class KerasAgent:
         for move in valid_moves:
             slot = move['slot']
             card_id = move['card']
-            pred_idx = slot * 5 + (card_id - 1)
-            if 0 <= pred_idx < 50:
+            pred_idx = topology.action_index(slot, card_id)
+            if 0 <= pred_idx < topology.action_space_size:
                 move_to_pred_idx[tuple(sorted(move.items()))] = pred_idx
 
         for move in valid_moves:
@@ -88,35 +90,35 @@ class KerasAgent:
         return best_move
 
 
-if __name__ == "__main__":
-    print("Menjalankan Mode Perbandingan AI (MCTS vs Keras)...")
-
-    NUM_EVAL_GAMES = 100
-    MCTS_SIMULATIONS = 500
-    MODEL_H5_PATH = "models/logic_gate_ai_selfplay_episode_14000.h5"
-
-    if not os.path.exists(MODEL_H5_PATH):
-        print(f"\n❌ Error: File model '{MODEL_H5_PATH}' tidak ditemukan.")
+def run_keras_comparison(model_path="models/logic_gate_ai_selfplay_episode_14000.h5", num_games=100, mcts_simulations=500,
+                         record_path=None):
+    if not os.path.exists(model_path):
+        print(f"\n❌ Error: File model '{model_path}' tidak ditemukan.")
         print("Pastikan file .h5 ada di direktori yang sama dengan script ini atau berikan path lengkap.")
         sys.exit(1)
 
+    import tensorflow as tf
+
+    print("TensorFlow version:", tf.__version__)
+
     print("\n" + "#"*70)
     print("### MATCH 1: Keras AI (Player 1) vs MCTS AI (Player 2) ###")
     print("#"*70)
 
     try:
-        agent_keras_p1 = KerasAgent(model_path=MODEL_H5_PATH, player_id=1)
+        agent_keras_p1 = KerasAgent(model_path=model_path, player_id=1)
     except Exception as e:
         print(f"\n❌ Gagal membuat KerasAgent: {e}")
         sys.exit(1)
         
-    agent_mcts_p2 = MCTSAgent(num_simulations=MCTS_SIMULATIONS, player_id=2)
+    agent_mcts_p2 = MCTSAgent(num_simulations=mcts_simulations, player_id=2)
 
     results1 = evaluate_two_agents(
-        num_games=NUM_EVAL_GAMES,
+        num_games=num_games,
         agent1=agent_keras_p1,
         agent2=agent_mcts_p2,
-        show_progress=True
+        show_progress=True,
+        record_path=suffixed_path(record_path, "keras_p1") if record_path else None
     )
     display_evaluation_results(results1, agent1_name="Keras AI", agent2_name="MCTS AI")
 
@@ -124,26 +126,27 @@ if __name__ == "__main__":
     print("### MATCH 2: MCTS AI (Player 1) vs Keras AI (Player 2) ###")
     print("#"*70)
 
-    agent_mcts_p1 = MCTSAgent(num_simulations=MCTS_SIMULATIONS, player_id=1)
+    agent_mcts_p1 = MCTSAgent(num_simulations=mcts_simulations, player_id=1)
     try:
-        agent_keras_p2 = KerasAgent(model_path=MODEL_H5_PATH, player_id=2)
+        agent_keras_p2 = KerasAgent(model_path=model_path, player_id=2)
     except Exception as e:
         print(f"\n❌ Gagal membuat KerasAgent: {e}")
         sys.exit(1)
 
     results2 = evaluate_two_agents(
-        num_games=NUM_EVAL_GAMES,
+        num_games=num_games,
         agent1=agent_mcts_p1,
         agent2=agent_keras_p2,
-        show_progress=True
+        show_progress=True,
+        record_path=suffixed_path(record_path, "mcts_p1") if record_path else None
     )
     display_evaluation_results(results2, agent1_name="MCTS AI", agent2_name="Keras AI")
 
     print("\n" + "="*70)
     print("📊 RINGKASAN KESELURUHAN")
     print("="*70)
-    print(f"Total Games per Matchup: {NUM_EVAL_GAMES}")
-    print(f"MCTS Simulations: {MCTS_SIMULATIONS}")
+    print(f"Total Games per Matchup: {num_games}")
+    print(f"MCTS Simulations: {mcts_simulations}")
     print("-" * 70)
     print("Match 1: Keras AI (P1) vs MCTS AI (P2)")
     print(f"  Keras AI Wins: {results1['p1_wins']} ({results1.get('p1_win_rate', 0):.1%})")
@@ -155,3 +158,10 @@ if __name__ == "__main__":
     print(f"  Keras AI Wins: {results2['p2_wins']} ({results2.get('p2_win_rate', 0):.1%})")
     print(f"  Draws:         {results2['draws']} ({results2.get('draw_rate', 0):.1%})")
     print("="*70)
+
+    return results1, results2
+
+
+if __name__ == "__main__":
+    print("Menjalankan Mode Perbandingan AI (MCTS vs Keras)...")
+    run_keras_comparison()
\ No newline at end of file
@@ -1,19 +1,27 @@
 import numpy as np
 import time
-from collections import defaultdict
 
 try:
-    from .evaluation_utils import setup_python_path, display_evaluation_results
+    from .evaluation_utils import setup_python_path, display_evaluation_results, end_game
 except ImportError:
-    from evaluation_utils import setup_python_path, display_evaluation_results
+    from evaluation_utils import setup_python_path, display_evaluation_results, end_game
 
 setup_python_path()
 
+try:
+    from .game_record_analyzer import opening_statistics, display_opening_statistics
+except ImportError:
+    from game_record_analyzer import opening_statistics, display_opening_statistics
+
 from src.game_logic.state import GameState
 from src.game_logic.mcts_agent import MCTSAgent
-from src.config import ID_TO_CARD
+from src.game_logic.game_record import (
+    GameRecordWriter, pack_game, records_from_bytes, load_game_records, suffixed_path
+)
+from src.game_logic.topology import DEFAULT_TOPOLOGY
 
-def evaluate_ai_performance(num_games=100, ai1_simulations=500, ai2_simulations=500, show_progress=True):
+def evaluate_ai_performance(num_games=100, ai1_simulations=500, ai2_simulations=500, show_progress=True,
+                            record_path=None, record_search_stats=False):
     ai1 = MCTSAgent(num_simulations=ai1_simulations, player_id=1)
     ai2 = MCTSAgent(num_simulations=ai2_simulations, player_id=2)
 
@@ -30,27 +38,34 @@ def evaluate_ai_performance(num_games=100, ai1_simulations=500, ai2_simulations=
     print(f"AI2 (Target=0): {ai2_simulations} simulasi MCTS")
     print(f"{'='*70}\n")
 
+    game_log = GameRecordWriter(record_path, with_stats=record_search_stats) if record_path else None
+
     for game_num in range(num_games):
         if show_progress and (game_num + 1) % 10 == 0:
             print(f"Progress: {game_num + 1}/{num_games} games", end="\r")
 
         game = GameState(player1_target=1, player2_target=0)
         move_count = 0
+        moves = []
+        search_stats = []
 
         while not game.is_terminal():
             valid_moves = game.get_valid_moves()
             if not valid_moves:
                 break
 
-            if game.current_player == 1:
-                move = ai1.select_move(game)
-            else:
-                move = ai2.select_move(game)
+            ai = ai1 if game.current_player == 1 else ai2
+            move = ai.select_move(game)
 
             game.apply_move(move)
             move_count += 1
+            moves.append(move)
+            search_stats.append(ai.last_search_info)
 
+        end_game(ai1, ai2)
         winner = game.get_winner()
+        if game_log is not None:
+            game_log.write_game(moves, winner, game.player1_target, game.player2_target, search_stats)
 
         if winner == 1:
             results['ai1_wins'] += 1
@@ -60,6 +75,9 @@ def evaluate_ai_performance(num_games=100, ai1_simulations=500, ai2_simulations=
             results['draws'] += 1
         results['game_lengths'].append(move_count)
 
+    if game_log is not None:
+        game_log.close()
+
     if show_progress:
         print(f"Progress: {num_games}/{num_games} games - SELESAI!     ")
 
@@ -82,7 +100,7 @@ def evaluate_ai_performance(num_games=100, ai1_simulations=500, ai2_simulations=
 
     return results
 
-def compare_different_simulations(num_games_per_config=50):
+def compare_different_simulations(num_games_per_config=50, position_cache=None, record_path=None):
     print(f"\n{'='*70}")
     print("🔬 EVALUASI KOMPARATIF: Pengaruh Jumlah Simulasi MCTS")
     print(f"{'='*70}\n")
@@ -100,8 +118,8 @@ def compare_different_simulations(num_games_per_config=50):
     for ai1_sims, ai2_sims in simulation_configs:
         print(f"\n🎯 Testing: AI1({ai1_sims} sims) vs AI2({ai2_sims} sims)")
         
-        ai1 = MCTSAgent(num_simulations=ai1_sims, player_id=1)
-        ai2 = MCTSAgent(num_simulations=ai2_sims, player_id=2)
+        ai1 = MCTSAgent(num_simulations=ai1_sims, player_id=1, position_cache=position_cache)
+        ai2 = MCTSAgent(num_simulations=ai2_sims, player_id=2, position_cache=position_cache)
 
         results = {
             'ai1_wins': 0,
@@ -110,8 +128,13 @@ def compare_different_simulations(num_games_per_config=50):
             'game_lengths': []
         }
 
+        game_log = None
+        if record_path:
+            game_log = GameRecordWriter(suffixed_path(record_path, f"{ai1_sims}v{ai2_sims}"))
+
         for game_num in range(num_games_per_config):
             game = GameState(player1_target=1, player2_target=0)
+            moves = []
             while not game.is_terminal():
                 valid_moves = game.get_valid_moves()
                 if not valid_moves:
@@ -121,8 +144,12 @@ def compare_different_simulations(num_games_per_config=50):
                 else:
                     move = ai2.select_move(game)
                 game.apply_move(move)
-            
+                moves.append(move)
+
+            end_game(ai1, ai2)
             winner = game.get_winner()
+            if game_log is not None:
+                game_log.write_game(moves, winner, game.player1_target, game.player2_target)
             if winner == 1:
                 results['ai1_wins'] += 1
             elif winner == 2:
@@ -131,6 +158,9 @@ def compare_different_simulations(num_games_per_config=50):
                 results['draws'] += 1
             results['game_lengths'].append(len(game.card_slots) - np.count_nonzero(game.card_slots==0))
 
+        if game_log is not None:
+            game_log.close()
+
         results['ai1_win_rate'] = results['ai1_wins'] / num_games_per_config
         results['ai2_win_rate'] = results['ai2_wins'] / num_games_per_config
         results['draw_rate'] = results['draws'] / num_games_per_config
@@ -157,6 +187,11 @@ def compare_different_simulations(num_games_per_config=50):
               f"{res['draw_rate']:>6.1%} | {res['avg_length']:>10.2f}")
 
     print(f"{'='*90}\n")
+    if position_cache is not None:
+        cache_stats = position_cache.stats()
+        print(f"🗄️  Position cache: {cache_stats['entries']} entri, hit rate {cache_stats['hit_rate']:.1%}")
+        print("⚠️  Dengan position cache sebagian kunjungan tiap langkah berasal dari prior cache;")
+        print("   hasil ini tidak bisa dibandingkan langsung dengan run tanpa cache.\n")
     print("💡 INSIGHTS:")
     print("  • Semakin banyak simulasi MCTS → AI semakin kuat")
     print("  • Perbedaan simulasi yang besar → Win rate berbeda signifikan")
@@ -165,56 +200,59 @@ def compare_different_simulations(num_games_per_config=50):
 
     return comparison_results
 
-def evaluate_opening_strategies(num_games=100):
+def evaluate_opening_strategies(num_games=100, record_path=None, replay_only=False, topology=DEFAULT_TOPOLOGY):
     print(f"\n{'='*70}")
     print("🎲 EVALUASI STRATEGI PEMBUKAAN")
     print(f"{'='*70}\n")
 
-    ai = MCTSAgent(num_simulations=500, player_id=2)
-
-    opening_moves = defaultdict(int)
-    opening_wins = defaultdict(int)
-
-    for game_num in range(num_games):
-        if (game_num + 1) % 20 == 0:
-            print(f"Progress: {game_num + 1}/{num_games} games", end="\r")
-
-        game = GameState(player1_target=1, player2_target=0)
-
-        ai_temp = MCTSAgent(num_simulations=500, player_id=1)
-        first_move = ai_temp.select_move(game)
+    # Statistik pembukaan dihitung dari record game (bisa dari log yang sudah ada),
+    # bukan dari counter terpisah, sehingga analisis ulang tidak perlu simulasi lagi.
+    if replay_only and not record_path:
+        raise ValueError("replay_only requires record_path")
+    if replay_only:
+        records, header = load_game_records(record_path)
+        topology = header['topology']
+        num_games = len(records)
+        print(f"Membaca {num_games} games dari {record_path}\n")
+    else:
+        ai = MCTSAgent(num_simulations=500, player_id=2)
+        game_log = GameRecordWriter(record_path, topology=topology) if record_path else None
+        packed_games = []
+
+        for game_num in range(num_games):
+            if (game_num + 1) % 20 == 0:
+                print(f"Progress: {game_num + 1}/{num_games} games", end="\r")
+
+            game = GameState(player1_target=1, player2_target=0, topology=topology)
+            ai_temp = MCTSAgent(num_simulations=500, player_id=1)
+            moves = []
 
-        move_key = f"Slot {first_move['slot']} - {ID_TO_CARD[first_move['card']]}"
-        opening_moves[move_key] += 1
-
-        game.apply_move(first_move)
-
-        while not game.is_terminal():
-            valid_moves = game.get_valid_moves()
-            if not valid_moves:
-                break
-
-            if game.current_player == 1:
-                move = ai_temp.select_move(game)
-            else:
-                move = ai.select_move(game)
+            while not game.is_terminal():
+                valid_moves = game.get_valid_moves()
+                if not valid_moves:
+                    break
 
-            game.apply_move(move)
+                if game.current_player == 1:
+                    move = ai_temp.select_move(game)
+                else:
+                    move = ai.select_move(game)
 
-        if game.get_winner() == 1:
-            opening_wins[move_key] += 1
+                game.apply_move(move)
+                moves.append(move)
 
-    print(f"Progress: {num_games}/{num_games} games - SELESAI!     \n")
+            end_game(ai_temp, ai)
+            packed = pack_game(moves, game.get_winner(), game.player1_target, game.player2_target, topology)
+            packed_games.append(packed)
+            if game_log is not None:
+                game_log.write_packed(packed)
 
-    print(f"{'Opening Move':<20} | {'Frequency':<12} | {'Win Rate':<10}")
-    print(f"{'-'*50}")
+        if game_log is not None:
+            game_log.close()
 
-    sorted_openings = sorted(opening_moves.items(), key=lambda x: x[1], reverse=True)
+        records = records_from_bytes(b''.join(packed_games), topology)
+        print(f"Progress: {num_games}/{num_games} games - SELESAI!     \n")
 
-    for move, freq in sorted_openings:
-        wins = opening_wins[move]
-        win_rate = wins / freq if freq > 0 else 0
-        print(f"{move:<20} | {freq:>4} ({freq/num_games:>5.1%}) | {win_rate:>8.1%}")
+    display_opening_statistics(opening_statistics(records, topology))
 
     print(f"{'='*70}\n")
 